@@ -200,11 +200,13 @@ def _handle_post_login_scenarios(driver, timeout, interactive=False):
 
     # Handle remember me prompt
     if current_url == "https://www.linkedin.com/checkpoint/lg/login-submit":
+        # Drivers run with no implicit wait, so give the prompt a moment to render
         try:
-            remember = driver.find_element(By.ID, c.REMEMBER_PROMPT)
-            if remember:
-                remember.submit()
-        except NoSuchElementException:
+            remember = WebDriverWait(driver, 3).until(
+                EC.presence_of_element_located((By.ID, c.REMEMBER_PROMPT))
+            )
+            remember.submit()
+        except (NoSuchElementException, TimeoutException):
             pass
 
     # Verify successful login
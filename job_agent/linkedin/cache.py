@@ -0,0 +1,287 @@
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Iterable, List, Optional
+
+import orjson
+from cachetools import LRUCache
+
+# Get a logger for this module
+logger = logging.getLogger(__name__)
+
+CACHE_DIR = os.path.expanduser("~/.cache/job-agent")
+FIT_CACHE_PATH = os.path.join(CACHE_DIR, "fit.sqlite")
+FIT_CACHE_MAX_ENTRIES = 10_000
+# Fit answers older than this are re-asked, so prompt/model improvements reach reposted jobs too.
+FIT_CACHE_MAX_AGE = 7 * 24 * 3600
+EMBEDDING_CACHE_PATH = os.path.join(CACHE_DIR, "embeddings.sqlite")
+EMBEDDING_CACHE_MAX_ENTRIES = 20_000
+STRUCTURE_CACHE_PATH = os.path.join(CACHE_DIR, "site_structures.sqlite")
+STRUCTURE_CACHE_MAX_ENTRIES = 2048
+# Structures kept decoded in memory in front of the SQLite table.
+STRUCTURE_CACHE_MEMORY_ENTRIES = 512
+
+
+class SqliteLRUCache:
+    """
+    Small persistent LRU cache of JSON values in a SQLite table, shared by the
+    job-fit and embedding caches. Entries past `max_age` read as misses and
+    are overwritten when the fresh value is stored.
+    """
+
+    name = "Cache"
+
+    def __init__(self, path: str, max_entries: int, max_age: Optional[float] = None):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.max_entries = max_entries
+        # Seconds after being stored that an entry stops being served (None: never)
+        self.max_age = max_age
+        self.hits = 0
+        self.misses = 0
+        # The connection may be handed between threads; subclasses used concurrently lock around it.
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        # WAL: each insert appends to the log instead of rewriting pages, and readers never block writers
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, last_access REAL NOT NULL, "
+            "stored_at REAL NOT NULL DEFAULT 0)"
+        )
+        columns = {row[1] for row in self.conn.execute("PRAGMA table_info(entries)")}
+        if "stored_at" not in columns:
+            # Caches created before entries had an age: count them from their last use
+            self.conn.execute(
+                "ALTER TABLE entries ADD COLUMN stored_at REAL NOT NULL DEFAULT 0"
+            )
+            self.conn.execute("UPDATE entries SET stored_at = last_access")
+        self.conn.execute(
+            "CREATE INDEX IF NOT EXISTS entries_last_access ON entries(last_access)"
+        )
+        self.conn.commit()
+
+    @staticmethod
+    def hash_key(*parts: Any) -> str:
+        raw = "\0".join("" if part is None else str(part) for part in parts)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[Any]:
+        row = self.conn.execute(
+            "SELECT value, stored_at FROM entries WHERE key = ?", (key,)
+        ).fetchone()
+        now = time.time()
+        if row is None or (self.max_age is not None and now - row[1] > self.max_age):
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.conn.execute(
+            "UPDATE entries SET last_access = ? WHERE key = ?", (now, key)
+        )
+        self.conn.commit()
+        return orjson.loads(row[0])
+
+    def set(self, key: str, value: Any):
+        self.set_many([(key, value)])
+
+    def set_many(self, items: List[tuple]):
+        now = time.time()
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO entries (key, value, last_access, stored_at) VALUES (?, ?, ?, ?)",
+            [(key, orjson.dumps(value).decode(), now, now) for key, value in items],
+        )
+        self._cull()
+        self.conn.commit()
+
+    def _cull(self):
+        """Evicts the least recently used entries above max_entries."""
+        (count,) = self.conn.execute("SELECT COUNT(*) FROM entries").fetchone()
+        if count > self.max_entries:
+            self.conn.execute(
+                "DELETE FROM entries WHERE key IN (SELECT key FROM entries ORDER BY last_access ASC LIMIT ?)",
+                (count - self.max_entries,),
+            )
+
+    def log_stats(self):
+        total = self.hits + self.misses
+        hit_rate = (self.hits / total * 100) if total else 0.0
+        logger.info(
+            f"{self.name}: {self.hits} hits, {self.misses} misses ({hit_rate:.0f}% hit rate)"
+        )
+
+
+class FitCache(SqliteLRUCache):
+    """
+    Persistent LRU cache for LLM job-fit results, so reposted listings with an
+    unchanged description skip the OpenAI API for FIT_CACHE_MAX_AGE.
+    """
+
+    name = "Fit cache"
+
+    def __init__(
+        self,
+        path: str = FIT_CACHE_PATH,
+        max_entries: int = FIT_CACHE_MAX_ENTRIES,
+        max_age: Optional[float] = FIT_CACHE_MAX_AGE,
+    ):
+        super().__init__(path, max_entries, max_age)
+
+    @staticmethod
+    def make_key(
+        model: str, prompt_version: int, cv_summary: str, job_description: str
+    ) -> str:
+        return SqliteLRUCache.hash_key(
+            model, prompt_version, cv_summary, job_description
+        )
+
+
+class EmbeddingCache(SqliteLRUCache):
+    """Persistent LRU cache of embedding vectors, keyed by model and text."""
+
+    name = "Embedding cache"
+
+    def __init__(
+        self,
+        path: str = EMBEDDING_CACHE_PATH,
+        max_entries: int = EMBEDDING_CACHE_MAX_ENTRIES,
+    ):
+        super().__init__(path, max_entries)
+
+    @staticmethod
+    def make_key(model: str, text: str) -> str:
+        return SqliteLRUCache.hash_key(model, text)
+
+
+class StructureCache(SqliteLRUCache):
+    """
+    Persistent LRU cache of LLM-analysed application form structures, keyed by
+    '<domain>:<form fingerprint>', with a small decoded in-memory front. Safe
+    to share between applicators running in parallel threads.
+
+    Many boards on the same ATS produce identical structures, so each distinct
+    structure is stored once in `structures` (by content hash) and `entries`
+    only maps keys to that hash.
+    """
+
+    name = "Structure cache"
+
+    def __init__(
+        self,
+        path: str = STRUCTURE_CACHE_PATH,
+        max_entries: int = STRUCTURE_CACHE_MAX_ENTRIES,
+    ):
+        super().__init__(path, max_entries)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS structures (hash TEXT PRIMARY KEY, value TEXT NOT NULL)"
+        )
+        # Finds whether any key still points to a structure without scanning every entry
+        self.conn.execute("CREATE INDEX IF NOT EXISTS entries_value ON entries(value)")
+        self.conn.commit()
+        self.memory = LRUCache(maxsize=STRUCTURE_CACHE_MEMORY_ENTRIES)
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def make_key(domain: str, fingerprint: str) -> str:
+        return f"{domain}:{fingerprint}"
+
+    def get(self, key: str) -> Optional[Any]:
+        with self.lock:
+            value = self.memory.get(key)
+            if value is not None:
+                self.hits += 1
+                return value
+            row = self.conn.execute(
+                "SELECT s.value FROM entries e JOIN structures s ON s.hash = e.value WHERE e.key = ?",
+                (key,),
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self.conn.execute(
+                "UPDATE entries SET last_access = ? WHERE key = ?", (time.time(), key)
+            )
+            self.conn.commit()
+            value = self.memory[key] = orjson.loads(row[0])
+            return value
+
+    def set_many(self, items: List[tuple]):
+        now = time.time()
+        structures = {}
+        mappings = []
+        for key, value in items:
+            payload = orjson.dumps(value, option=orjson.OPT_SORT_KEYS).decode()
+            content_hash = hashlib.blake2b(
+                payload.encode("utf-8"), digest_size=16
+            ).hexdigest()
+            structures[content_hash] = payload
+            mappings.append((key, content_hash, now))
+        with self.lock:
+            # Structures the overwritten keys pointed to, which may now be unused
+            replaced = []
+            for key, _, _ in mappings:
+                row = self.conn.execute(
+                    "SELECT value FROM entries WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    replaced.append(row[0])
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO structures (hash, value) VALUES (?, ?)",
+                list(structures.items()),
+            )
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO entries (key, value, last_access) VALUES (?, ?, ?)",
+                mappings,
+            )
+            self._drop_orphans(replaced)
+            self._cull()
+            self.conn.commit()
+            for key, value in items:
+                self.memory[key] = value
+
+    def _cull(self):
+        """
+        Evicts the least recently used entries above max_entries, then the
+        structures only those entries pointed to.
+        """
+        (count,) = self.conn.execute("SELECT COUNT(*) FROM entries").fetchone()
+        if count <= self.max_entries:
+            return
+        evicted = self.conn.execute(
+            "SELECT key, value FROM entries ORDER BY last_access ASC LIMIT ?",
+            (count - self.max_entries,),
+        ).fetchall()
+        self.conn.executemany(
+            "DELETE FROM entries WHERE key = ?", [(key,) for key, _ in evicted]
+        )
+        for key, _ in evicted:
+            self.memory.pop(key, None)
+        self._drop_orphans(content_hash for _, content_hash in evicted)
+
+    def _drop_orphans(self, hashes: Iterable[str]):
+        """Deletes those of `hashes` that no key points to any more (index lookups only)."""
+        self.conn.executemany(
+            "DELETE FROM structures WHERE hash = ? "
+            "AND NOT EXISTS (SELECT 1 FROM entries WHERE value = ?)",
+            [(content_hash, content_hash) for content_hash in set(hashes)],
+        )
+
+    def find_by_domain(self, domain: str) -> Optional[Any]:
+        """The most recently used structure of any form on this domain."""
+        prefix = f"{domain}:"
+        return self._find("substr(e.key, 1, ?) = ?", (len(prefix), prefix))
+
+    def find_by_fingerprint(self, fingerprint: str) -> Optional[Any]:
+        """A structure of the identical form seen on any domain."""
+        suffix = f":{fingerprint}"
+        return self._find("substr(e.key, -?) = ?", (len(suffix), suffix))
+
+    def _find(self, condition: str, params: tuple) -> Optional[Any]:
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT s.value FROM entries e JOIN structures s ON s.hash = e.value "
+                f"WHERE {condition} ORDER BY e.last_access DESC LIMIT 1",
+                params,
+            ).fetchone()
+            return orjson.loads(row[0]) if row else None
@@ -1,12 +1,20 @@
 from abc import ABC, abstractmethod
+import asyncio
+import functools
+import hashlib
 import logging
 from selenium.webdriver.remote.webdriver import WebDriver
-from .main import JobScraperAgent
+from .cache import CACHE_DIR, StructureCache
+from .main import JobScraperAgent, create_chrome_driver
 import json
 import os
+import queue
+import re
+import threading
 import time
 from urllib.parse import urlparse
-from bs4 import BeautifulSoup
+import orjson
+from lxml import etree, html as lxml_html
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
@@ -14,27 +22,205 @@ from selenium.common.exceptions import TimeoutException, NoSuchElementException
 from .model import Country, JobType, ScraperInput, Site, JobResponse, ExperienceLevel
 # ... other imports
 from selenium.webdriver.support.ui import Select  # <-- THIS LINE MUST BE PRESENT
-import PyPDF2
+import pypdf
+
+# Number of browsers preparing applications in parallel.
+APPLY_WORKERS = 4
+# Most forms answered by one gpt-4o request.
+ANSWER_BATCH_SIZE = 4
+# The page is ready for analysis once form controls have rendered and their count
+# stopped changing between two polls (SPAs stream fields in after readyState).
+FORM_READY_SELECTOR = "input, textarea, select"
+FORM_SETTLE_POLL_SECONDS = 0.1
+FORM_SETTLE_TIMEOUT = 5
+
+# Elements that only cost tokens in the analysis prompt, removed in one C-level pass.
+_STRIP_ELEMENTS = etree.XPath("//script|//style|//svg|//noscript|//header|//footer|//nav")
+# One reusable lxml parser per worker thread (parsers are not thread-safe). Comments and
+# processing instructions are dropped while parsing, never reaching the prompt.
+_parser_local = threading.local()
+
+def _html_parser():
+    parser = getattr(_parser_local, "parser", None)
+    if parser is None:
+        parser = _parser_local.parser = lxml_html.HTMLParser(remove_comments=True, remove_pis=True)
+    return parser
+
+# Form controls and the attributes that make up a form's fingerprint (labels, options and styling excluded).
+_FORM_CONTROLS = etree.XPath(
+    "descendant-or-self::*[self::form or self::input or self::select or self::textarea or self::button]"
+)
+_FINGERPRINT_ATTRIBUTES = ('name', 'id', 'type', 'required')
+# Only this window of raw HTML around the first <form> is parsed; the prompt keeps far less anyway.
+_FORM_START_RE = re.compile(r"<form\b", re.IGNORECASE)
+FORM_WINDOW_BEFORE = 200
+FORM_WINDOW_AFTER = 60_000
+# Same control skeleton as _FORM_CONTROLS/_FINGERPRINT_ATTRIBUTES, read from the live DOM so a
+# cache hit never has to pull page_source over WebDriver.
+_FORM_SKELETON_JS = """
+const skip = 'header, footer, nav, noscript, svg, script, style';
+const controls = 'form, input, select, textarea, button';
+const kept = el => !el.closest(skip);
+const root = [...document.querySelectorAll('form')].find(kept)
+    || [...document.querySelectorAll('main')].find(kept)
+    || document.body;
+if (!root) return [];
+return [root, ...root.querySelectorAll(controls)]
+    .filter(el => el.matches(controls) && kept(el))
+    .map(el => [el.tagName.toLowerCase(), ...arguments[0].map(attr => el.getAttribute(attr))]);
+"""
+# Sets a text field in one call (send_keys is one event per character). Uses the prototype's
+# value setter so React-controlled inputs register it; returns whether the value stuck.
+_SET_VALUE_JS = """
+const el = arguments[0], value = arguments[1];
+el.focus();
+const setter = Object.getOwnPropertyDescriptor(Object.getPrototypeOf(el), 'value');
+if (setter && setter.set) { setter.set.call(el, value); } else { el.value = value; }
+el.dispatchEvent(new Event('input', {bubbles: true}));
+el.dispatchEvent(new Event('change', {bubbles: true}));
+return el.value === value;
+"""
+# Candidate submit buttons for the targeted re-analysis (outside header/footer/nav, trimmed).
+_BUTTONS_JS = """
+return [...document.querySelectorAll('button, input[type=submit]')]
+    .filter(el => !el.closest('header, footer, nav'))
+    .map(el => el.outerHTML.slice(0, arguments[0]));
+"""
+BUTTON_HTML_MAX_CHARS = 300
+SUBMIT_PROMPT = """
+You are a Selenium automation expert. Below are the buttons of a job application form.
+Identify the one that submits the application.
+Return a JSON object: {"text": "The visible text on the button", "selector": "A precise CSS selector"}.
+If none of them submits the application, return {}.
+"""
+# The name attribute in a radio group selector like "[name='gender']" or '[name="gender"]'.
+_NAME_RE = re.compile(r"\[name=['\"]([^'\"]+)['\"]\]")
+
+class _AnswerStream:
+    """
+    Incremental parser for streamed answers shaped like
+    {"<form id>": {"<field label>": <value>, ...}, ...}: feed() returns each
+    (form id, label, value) as soon as that value is complete, so fields can be
+    filled while the rest of the response is still arriving.
+    """
+    def __init__(self):
+        self.buffer = ""
+        self.pos = 0
+        self.depth = 0
+        self.form_id = None
+        self.label = None
+        self.decoder = json.JSONDecoder()
+
+    def _decode(self):
+        """Decodes the JSON value at pos, or returns None while it is still incomplete."""
+        try:
+            value, end = self.decoder.raw_decode(self.buffer, self.pos)
+        except json.JSONDecodeError:
+            return None
+        # A number or literal at the very end of the buffer may still be growing
+        if end >= len(self.buffer):
+            return None
+        self.pos = end
+        return (value,)
+
+    def feed(self, text):
+        self.buffer += text
+        completed = []
+        while self.pos < len(self.buffer):
+            char = self.buffer[self.pos]
+            if char in " \t\r\n,:":
+                self.pos += 1
+            elif self.depth == 2 and self.label is not None:
+                decoded = self._decode()
+                if decoded is None:
+                    break
+                completed.append((self.form_id, self.label, decoded[0]))
+                self.label = None
+            elif char == "{":
+                self.depth += 1
+                self.pos += 1
+            elif char == "}":
+                self.depth -= 1
+                self.pos += 1
+            elif char == '"' and self.depth in (1, 2):
+                decoded = self._decode()
+                if decoded is None:
+                    break
+                if self.depth == 1:
+                    self.form_id = decoded[0]
+                else:
+                    self.label = decoded[0]
+            else:
+                # Anything else (e.g. a non-object form entry) is skipped whole
+                decoded = self._decode()
+                if decoded is None:
+                    break
+        return completed
+
+
+# Everything in the answer system prompt is identical for every job (rules first, then the
+# static profile), so OpenAI's automatic prompt caching reuses it after the first call.
+ANSWER_PROMPT_TEMPLATE = """
+        You are a job application assistant. 
+        Map the candidate's profile to the form fields provided.
+        
+        The user message lists one or more forms: {{ "forms": [{{ "id": "0", "structure": {{...}} }}] }}
+        
+        Rules:
+        1. Return JSON keyed by form id: {{ "0": {{ "field_label": "value_to_fill" }}, "1": {{...}} }}
+        2. If a field is marked "required": true in the form structure, you MUST generate a valid answer based on the resume, even if imperfect.
+        3. If a field is NOT required and the data is missing from the profile, return "N/A".
+        4.  For "select" or "radio" fields, I will provide the "options". 
+            You MUST choose the best option and return its corresponding "value" attribute.
+            Example: If options are `[...{{"text": "Black or African American", "value": "B"}}]` 
+            and profile says `Ethiopian`, you return "B".
+        5.  For "select" fields, if no option matches, return the "value" of the first option 
+            (it's often "Select..." or empty).
+        6.  For file uploads ("Resume/CV"), return the exact "resume_path" from the profile.
+        7.  For "Why do you want to work here?", "Salary Expectation", or "Additional Information", 
+            use the **"resume_text"** and other profile info to generate a short, professional answer.
+        8.  For unknown fields or EEO questions (Gender, Race, Veteran) where the profile 
+            doesn't specify, return "N/A" to skip them.
+        
+        Candidate Profile:
+        {profile_json}
+        """
+
 
 def _extract_pdf_text(pdf_path: str) -> str:
-    """Extracts text content from a PDF file."""
+    """
+    Extracts text content from a PDF file. The text is cached on disk keyed by
+    path, mtime and size, so an unchanged resume is only parsed once.
+    """
     if not os.path.exists(pdf_path):
         logging.error(f"Resume file not found at: {pdf_path}")
         return ""
+
+    stat = os.stat(pdf_path)
+    key = hashlib.blake2b(f"{pdf_path}:{stat.st_mtime_ns}:{stat.st_size}".encode("utf-8"), digest_size=16).hexdigest()
+    cache_path = os.path.join(CACHE_DIR, f"resume-{key}.txt")
+    if os.path.exists(cache_path):
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            return f.read()
     
     try:
         logging.info(f"Extracting text from {pdf_path}...")
-        text = ""
         with open(pdf_path, 'rb') as f:
-            reader = PyPDF2.PdfReader(f)
-            for page in reader.pages:
-                text += page.extract_text() or ""
+            reader = pypdf.PdfReader(f)
+            text = "".join(page.extract_text() or "" for page in reader.pages)
         
         logging.info(f"Successfully extracted {len(text)} characters from resume.")
-        return text
     except Exception as e:
         logging.error(f"Failed to read PDF: {e}")
         return ""
+
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        with open(cache_path, 'w', encoding='utf-8') as f:
+            f.write(text)
+    except OSError as e:
+        logging.warning(f"Could not cache resume text: {e}")
+    return text
     
 class BaseApplicator(ABC):
     def __init__(self, driver: WebDriver):
@@ -53,60 +239,116 @@ class BaseApplicator(ABC):
 
 
 class LLMGenericApplicator(BaseApplicator):
-    def __init__(self, driver, openai_client, cache_file="site_structures.json"):
+    # (candidate_data, formatted answer system prompt) of the current session
+    _answer_prompt = None
+
+    def __init__(self, driver, openai_client, structure_cache=None):
         super().__init__(driver)
         self.client = openai_client
-        self.cache_file = cache_file
-        self.structure_cache = self._load_cache()
+        # Applicators running in parallel share one structure cache
+        self.structure_cache = structure_cache if structure_cache is not None else StructureCache()
         self.wait = WebDriverWait(self.driver, 10)
 
-    def _load_cache(self):
-        if os.path.exists(self.cache_file):
-            try:
-                with open(self.cache_file, 'r') as f:
-                    return json.load(f)
-            except json.JSONDecodeError:
-                self.logger.warning(f"Cache file {self.cache_file} is corrupted. Starting fresh.")
-                return {}
-        return {}
-
-    def _save_cache(self):
-        with open(self.cache_file, 'w') as f:
-            json.dump(self.structure_cache, f, indent=2)
-
-    def _get_domain_key(self, url):
+    @staticmethod
+    @functools.lru_cache(maxsize=4096)
+    def _get_domain_key(url):
         """
         Returns a key like 'jobs.lever.co' or 'boards.greenhouse.io'.
-        We cache based on this, assuming structure is similar across the domain.
+        Combined with the form fingerprint to build the structure cache key.
         """
         return urlparse(url).netloc
 
-    def _clean_html(self, html_content):
+    def _form_root(self, html_content):
         """
         Crucial: Remove JS, CSS, and SVGs to save tokens and confuse the LLM less.
+        Returns the form element, else the main content area, else the body (None for an empty page).
         """
-        soup = BeautifulSoup(html_content, 'html.parser')
-        for element in soup(['script', 'style', 'svg', 'noscript', 'header', 'footer', 'nav']):
-            element.decompose()
-        # Return only the form or body
-        form = soup.find('form')
-        
-        # If no form tag, find the main content area
-        if not form:
-            form = soup.find('main')
-        
-        return str(form) if form else str(soup.body)
+        # Parse and strip with lxml directly (C) instead of walking a BeautifulSoup tree
+        if not html_content or not html_content.strip():
+            return None
+        tree = None
+        match = _FORM_START_RE.search(html_content)
+        if match:
+            # Slice before parsing so a 500KB page becomes a ~60KB parse
+            start = match.start()
+            tree = lxml_html.document_fromstring(
+                html_content[max(0, start - FORM_WINDOW_BEFORE):start + FORM_WINDOW_AFTER], parser=_html_parser()
+            )
+            if tree.find('.//form') is None:
+                # The match was inside a script or attribute, not a real form
+                tree = None
+        if tree is None:
+            tree = lxml_html.document_fromstring(html_content, parser=_html_parser())
+        for element in _STRIP_ELEMENTS(tree):
+            # drop_tree keeps the text that follows the removed element
+            element.drop_tree()
+
+        # Explicit None checks: lxml elements without children are falsy
+        for path in ('.//form', './/main', './/body'):
+            node = tree.find(path)
+            if node is not None:
+                return node
+        return tree
+
+    def _clean_html(self, html_content):
+        root = self._form_root(html_content)
+        return lxml_html.tostring(root, encoding='unicode') if root is not None else ""
+
+    def _form_fingerprint(self, root):
+        """Hash of the form's control skeleton (tag, name, id, type, required)."""
+        skeleton = []
+        if root is not None:
+            skeleton = [
+                [control.tag] + [control.get(attr) for attr in _FINGERPRINT_ATTRIBUTES]
+                for control in _FORM_CONTROLS(root)
+            ]
+        return self._hash_skeleton(skeleton)
+
+    def _page_fingerprint(self):
+        """Fingerprint of the loaded page's form, computed in the browser. None if the script fails."""
+        try:
+            skeleton = self.driver.execute_script(_FORM_SKELETON_JS, list(_FINGERPRINT_ATTRIBUTES))
+        except Exception as e:
+            self.logger.warning(f"Could not fingerprint the form in the browser: {e}")
+            return None
+        return self._hash_skeleton(skeleton)
+
+    @staticmethod
+    def _hash_skeleton(skeleton):
+        return hashlib.blake2b(orjson.dumps(skeleton), digest_size=16).hexdigest()
 
-    def _analyze_page_structure(self, url, html_content):
+    def _cached_structure(self, domain, fingerprint=None):
+        """
+        Looks up a cached structure. With a fingerprint: the exact form on this
+        domain, else the identical form seen on another domain (e.g. the same ATS
+        under a custom hostname). Without one: the last used form of this domain.
+        """
+        if fingerprint is None:
+            return self.structure_cache.find_by_domain(domain)
+        key = StructureCache.make_key(domain, fingerprint)
+        structure = self.structure_cache.get(key)
+        if structure is None:
+            structure = self.structure_cache.find_by_fingerprint(fingerprint)
+            if structure is not None:
+                # Map this domain too; the structure itself is stored once
+                self.structure_cache.set(key, structure)
+        return structure
+
+    def _analyze_page_structure(self, url, html_content, fingerprint=None):
         """
         Phase 1: Ask LLM to find input fields, selectors, options, AND required status.
+        The cache key uses the given (browser-side) fingerprint, else one computed from the HTML.
         """
         domain = self._get_domain_key(url)
+        root = self._form_root(html_content)
+        if fingerprint is None:
+            fingerprint = self._form_fingerprint(root)
         
-        # Check cache first
-        if domain in self.structure_cache:
+        # Check cache first (same form skeleton, not just same domain)
+        cached = self._cached_structure(domain, fingerprint)
+        if cached is not None:
             self.logger.info(f"Using cached structure for {domain}")
-            return self.structure_cache[domain]
+            return cached
 
         self.logger.info(f"Analyzing new site structure: {domain}...")
         
@@ -147,7 +389,7 @@ class LLMGenericApplicator(BaseApplicator):
         """
         
         # We truncate HTML to avoid token limits
-        clean_html = self._clean_html(html_content)[:15000] 
+        clean_html = (lxml_html.tostring(root, encoding='unicode') if root is not None else "")[:15000]
 
         response = self.client.chat.completions.create(
             model="gpt-4o-mini", 
@@ -158,197 +400,496 @@ class LLMGenericApplicator(BaseApplicator):
             ]
         )
         
-        structure = json.loads(response.choices[0].message.content)
+        structure = orjson.loads(response.choices[0].message.content)
         
         # Save to cache
-        self.structure_cache[domain] = structure
-        self._save_cache()
+        self.structure_cache.set(StructureCache.make_key(domain, fingerprint), structure)
         return structure
 
-    def _generate_field_values(self, form_structure, candidate_data):
+    def _answer_system_prompt(self, candidate_data):
+        """
+        candidate_data is treated as immutable for the session, so the profile is
+        serialized and formatted once and every request gets a byte-identical prompt.
+        """
+        cached = LLMGenericApplicator._answer_prompt
+        if cached is None or cached[0] is not candidate_data:
+            profile_json_string = orjson.dumps(candidate_data, default=str).decode()
+            cached = (candidate_data, ANSWER_PROMPT_TEMPLATE.format(profile_json=profile_json_string))
+            LLMGenericApplicator._answer_prompt = cached
+        return cached[1]
+
+    def _generate_field_values(self, form_structure, candidate_data, on_answer=None):
         """
         Phase 2: Ask LLM to map Candidate Data -> Form Fields and choose options.
         """
-        self.logger.info("Generating answers for form fields...")
-        
-        # Define the template as a regular string with a placeholder
-        prompt_template = """
-        You are a job application assistant. 
-        Map the candidate's profile to the form fields provided.
-        
-        Candidate Profile:
-        {profile_json}
-        
-        Rules:
-        1. Return JSON: {{ "field_label": "value_to_fill" }}
-        2. If a field is marked "required": true in the form structure, you MUST generate a valid answer based on the resume, even if imperfect.
-        3. If a field is NOT required and the data is missing from the profile, return "N/A".
-        4.  For "select" or "radio" fields, I will provide the "options". 
-            You MUST choose the best option and return its corresponding "value" attribute.
-            Example: If options are `[...{{"text": "Black or African American", "value": "B"}}]` 
-            and profile says `Ethiopian`, you return "B".
-        5.  For "select" fields, if no option matches, return the "value" of the first option 
-            (it's often "Select..." or empty).
-        6.  For file uploads ("Resume/CV"), return the exact "resume_path" from the profile.
-        7.  For "Why do you want to work here?", "Salary Expectation", or "Additional Information", 
-            use the **"resume_text"** and other profile info to generate a short, professional answer.
-        8.  For unknown fields or EEO questions (Gender, Race, Veteran) where the profile 
-            doesn't specify, return "N/A" to skip them.
+        if on_answer is not None:
+            # Single form: drop the form index from the callback
+            return self._generate_field_values_many(
+                [form_structure], candidate_data, on_answer=lambda _, label, value: on_answer(label, value)
+            )[0]
+        return self._generate_field_values_many([form_structure], candidate_data)[0]
+
+    def _generate_field_values_many(self, form_structures, candidate_data, on_answer=None):
         """
+        Phase 2 for several forms in one request, so the candidate profile is
+        sent once. Returns one answer dict per form, in order.
+
+        With on_answer, the response is streamed and on_answer(form_index, label,
+        value) is called for every answer as soon as it has fully arrived.
+        """
+        self.logger.info(f"Generating answers for {len(form_structures)} form(s)...")
         
-        # Inject the candidate data using .format()
-        profile_json_string = json.dumps(candidate_data, default=str)
-        system_prompt = prompt_template.format(profile_json=profile_json_string)
+        system_prompt = self._answer_system_prompt(candidate_data)
         
-        response = self.client.chat.completions.create(
+        request = dict(
             model="gpt-4o", # Smarter model for generating written answers
             response_format={"type": "json_object"},
             messages=[
                 {"role": "system", "content": system_prompt},
-                {"role": "user", "content": f"Form Structure: {json.dumps(form_structure)}"}
+                {"role": "user", "content": orjson.dumps(
+                    {"forms": [{"id": str(i), "structure": structure} for i, structure in enumerate(form_structures)]}
+                ).decode()}
             ]
         )
+        if on_answer is None:
+            response = self.client.chat.completions.create(**request)
+            usage = response.usage
+            content = response.choices[0].message.content
+        else:
+            usage = None
+            parts = []
+            parser = _AnswerStream()
+            stream = self.client.chat.completions.create(
+                **request, stream=True, stream_options={"include_usage": True}
+            )
+            for chunk in stream:
+                if chunk.usage:
+                    usage = chunk.usage
+                if not chunk.choices or not chunk.choices[0].delta.content:
+                    continue
+                parts.append(chunk.choices[0].delta.content)
+                for form_id, label, value in parser.feed(chunk.choices[0].delta.content):
+                    if isinstance(form_id, str) and form_id.isdigit() and int(form_id) < len(form_structures):
+                        on_answer(int(form_id), label, value)
+            content = "".join(parts)
+        details = getattr(usage, "prompt_tokens_details", None) if usage else None
+        if details and details.cached_tokens:
+            self.logger.info(f"Reused {details.cached_tokens}/{usage.prompt_tokens} cached prompt tokens.")
         
-        return json.loads(response.choices[0].message.content)
+        answers = orjson.loads(content)
+        missing = [str(i) for i in range(len(form_structures)) if not isinstance(answers.get(str(i)), dict)]
+        if missing:
+            self.logger.warning(f"No answers returned for form(s) {missing}.")
+        return [answers.get(str(i)) if isinstance(answers.get(str(i)), dict) else {} for i in range(len(form_structures))]
+
+    def _plan_field(self, field, target_value):
+        """
+        Checks one field and its AI answer. Returns (label, selector, type, value,
+        lookup selector) to fill, or None if the field is skipped.
+        """
+        label, selector, field_type = field.get('label'), field.get('selector'), field.get('type')
+        if not (label and selector and field_type):
+            self.logger.warning(f"Skipping malformed field from AI: {field}")
+            return None
+
+        # Not a set lookup: the AI may answer with a list, which isn't hashable
+        if not target_value or target_value == "N/A":
+            self.logger.info(f"Skipping field: {label}")
+            return None
+
+        lookup_selector = selector
+        if field_type == 'radio':
+            # The AI gives us the 'value' (e.g., "Yes" or "No" from the HTML).
+            # The 'selector' from Phase 1 is the 'name' attribute (e.g., "[name='...']").
+            name_match = _NAME_RE.search(selector)
+            if not name_match:
+                self.logger.error(f"Could not parse 'name' from radio selector: {selector}")
+                return None
+            lookup_selector = f"input[name='{name_match.group(1)}'][value='{target_value}']"
+
+        return label, selector, field_type, target_value, lookup_selector
 
-    def _fill_form(self, form_structure, filled_values):
+    def _fill_form(self, form_structure, filled_values, skip_labels=()):
         """
         Phase 3: Execute Selenium actions with robust logic.
+        Fields whose label is in skip_labels were already filled (streamed answers).
         """
         fields = form_structure.get("fields", [])
-        
+
+        # Work out what to fill first, so every element can be looked up in one round-trip
+        to_fill = []
+        plan_field = self._plan_field
         for field in fields:
             label = field.get('label')
-            selector = field.get('selector')
-            field_type = field.get('type')
-            
+            if label in skip_labels:
+                continue
             # The HTML 'value' chosen by the AI (e.g., "false", "Male", "B")
-            target_value = filled_values.get(label)
+            planned = plan_field(field, filled_values.get(label))
+            if planned:
+                to_fill.append(planned)
 
-            if not label or not selector or not field_type:
-                self.logger.warning(f"Skipping malformed field from AI: {field}")
-                continue
+        elements = self._find_elements([lookup for *_, lookup in to_fill])
 
-            if not target_value or target_value == "N/A":
-                self.logger.info(f"Skipping field: {label}")
-                continue
+        for planned, element in zip(to_fill, elements):
+            self._fill_field(planned, element)
 
-            try:
-                self.logger.info(f"Filling {label} ({field_type}) with value '{target_value}'...")
-                
-                # --- CASE 1: FILE UPLOAD ---
-                if field_type == 'file':
-                    # This selector must be for the <input type="file">
-                    # We use visibility_of_element_located to ensure it's interactable
-                    # Some sites hide it, so we use presence_of_element_located
-                    element = self.wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, selector)))
-                    element.send_keys(target_value)
-                
-                # --- CASE 2: DROPDOWNS (Select) ---
-                elif field_type == 'select':
-                    element = self.wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, selector)))
-                    select = Select(element)
+    def _fill_field(self, planned, element=None):
+        label, selector, field_type, target_value, lookup_selector = planned
+        try:
+            self.logger.info(f"Filling {label} ({field_type}) with value '{target_value}'...")
+
+            # Not looked up (or not rendered at lookup time): wait for it
+            if element is None:
+                if field_type == 'radio':
+                    element = self.wait.until(EC.element_to_be_clickable((By.CSS_SELECTOR, lookup_selector)))
+                else:
+                    # Some sites hide file inputs, so presence (not visibility) is enough
+                    element = self.wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, lookup_selector)))
+            
+            # --- CASE 1: FILE UPLOAD ---
+            if field_type == 'file':
+                # This selector must be for the <input type="file">
+                element.send_keys(target_value)
+            
+            # --- CASE 2: DROPDOWNS (Select) ---
+            elif field_type == 'select':
+                select = Select(element)
+                try:
+                    # 1. Try to select by VALUE (most reliable)
+                    select.select_by_value(target_value)
+                except NoSuchElementException:
+                    # 2. Fallback: Try to select by VISIBLE TEXT
                     try:
-                        # 1. Try to select by VALUE (most reliable)
-                        select.select_by_value(target_value)
+                        select.select_by_visible_text(target_value)
                     except NoSuchElementException:
-                        # 2. Fallback: Try to select by VISIBLE TEXT
-                        try:
-                            select.select_by_visible_text(target_value)
-                        except NoSuchElementException:
-                             self.logger.warning(f"Could not find option '{target_value}' for {label}. Skipping.")
-
-                # --- CASE 3: RADIO BUTTONS ---
-                elif field_type == 'radio':
-                    # The AI gives us the 'value' (e.g., "Yes" or "No" from the HTML).
-                    # The 'selector' from Phase 1 is the 'name' attribute (e.g., "[name='...']").
-                    
-                    name_attr = None
-                    if "[name='" in selector:
-                        name_attr = selector.split("[name='")[1].split("']")[0]
-                    
-                    if name_attr:
-                        option_selector = f"input[name='{name_attr}'][value='{target_value}']"
-                        
-                        element_to_click = self.wait.until(
-                            EC.element_to_be_clickable((By.CSS_SELECTOR, option_selector))
-                        )
-                        
-                        # Use JavaScript click (much more reliable for styled radio buttons)
-                        self.driver.execute_script("arguments[0].click();", element_to_click)
-                    else:
-                        self.logger.error(f"Could not parse 'name' from radio selector: {selector}")
-
-                # --- CASE 4: STANDARD TEXT INPUTS ---
-                else:
-                    element = self.wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, selector)))
+                         self.logger.warning(f"Could not find option '{target_value}' for {label}. Skipping.")
+
+            # --- CASE 3: RADIO BUTTONS ---
+            elif field_type == 'radio':
+                # Use JavaScript click (much more reliable for styled radio buttons)
+                self.driver.execute_script("arguments[0].click();", element)
+
+            # --- CASE 4: STANDARD TEXT INPUTS ---
+            else:
+                if not self.driver.execute_script(_SET_VALUE_JS, element, str(target_value)):
+                    # The component rejected the programmatic value: type it instead
                     element.clear()
                     element.send_keys(str(target_value))
-                    
-            except Exception as e:
-                self.logger.error(f"Failed to fill '{label}' (Selector: '{selector}', Value: '{target_value}'): {e}")
+                
+        except Exception as e:
+            self.logger.error(f"Failed to fill '{label}' (Selector: '{selector}', Value: '{target_value}'): {e}")
+
+    def _find_elements(self, selectors):
+        """
+        Resolves every CSS selector with a single execute_script call instead of
+        one WebDriver round-trip per field. Missing or invalid selectors give None.
+        """
+        if not selectors:
+            return []
+        try:
+            return self.driver.execute_script(
+                "return arguments[0].map(s => { try { return document.querySelector(s); } catch (e) { return null; } });",
+                selectors
+            )
+        except Exception as e:
+            self.logger.warning(f"Batched element lookup failed, falling back to per-field waits: {e}")
+            return [None] * len(selectors)
+
+    def _load_application_page(self, job_url):
+        self.logger.info(f"Navigating to job application: {job_url}")
+        self.driver.get(job_url)
+        self.wait.until(lambda d: d.execute_script('return document.readyState') == 'complete')
+        try:
+            self.wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, FORM_READY_SELECTOR)))
+        except TimeoutException:
+            self.logger.warning("No form controls rendered yet; analysing the page as is.")
+            return
+
+        last_count = [-1]
+        def controls_settled(driver):
+            count = driver.execute_script(
+                "return document.querySelectorAll(arguments[0]).length;", FORM_READY_SELECTOR
+            )
+            settled = count == last_count[0]
+            last_count[0] = count
+            return settled
+
+        try:
+            WebDriverWait(self.driver, FORM_SETTLE_TIMEOUT, poll_frequency=FORM_SETTLE_POLL_SECONDS).until(
+                controls_settled
+            )
+        except TimeoutException:
+            self.logger.warning("Form fields kept changing; analysing the page as is.")
+
+    def _page_html(self):
+        """
+        Reads the page HTML straight from Chrome over CDP (DOM.getOuterHTML)
+        instead of page_source; falls back to page_source off Chrome.
+        """
+        try:
+            # depth 0: only the root node id is needed, not the whole tree as JSON
+            root = self.driver.execute_cdp_cmd("DOM.getDocument", {"depth": 0})["root"]
+            return self.driver.execute_cdp_cmd("DOM.getOuterHTML", {"nodeId": root["nodeId"]})["outerHTML"]
+        except Exception as e:
+            self.logger.debug(f"CDP outerHTML unavailable, using page_source: {e}")
+            return self.driver.page_source
+
+    def load_and_analyse(self, job_url):
+        """Loads the application page and returns its structure, or None if it has no fields."""
+        self._load_application_page(job_url)
+
+        # Known form: the cached selectors are enough, so skip pulling and parsing page_source
+        domain = self._get_domain_key(job_url)
+        fingerprint = self._page_fingerprint()
+        structure = self._cached_structure(domain, fingerprint) if fingerprint is not None else None
+        if structure is not None:
+            self.logger.info(f"Using cached structure for {domain}")
+        else:
+            html = self._page_html()
+            structure = self._analyze_page_structure(job_url, html, fingerprint)
+
+        if not structure.get("fields"):
+            self.logger.error("Phase 1 Failed: AI did not return any fields to fill.")
+            return None
+        return structure
+
+    def prepare(self, job_url, candidate_data):
+        """
+        Navigates to the application, analyses it, generates answers and fills
+        the form. Returns the page structure, or None if nothing could be filled.
+        """
+        # 1. Scrape & Analyze (or load cache). Answers are only generated once the loaded
+        #    form is known: job boards ask different questions per posting, so answers
+        #    guessed from the domain's last form would mostly be paid for and thrown away.
+        structure = self.load_and_analyse(job_url)
+        if structure is None:
+            return None
+
+        # 2. Generate Content. The page is loaded, so fill each field as soon as its answer streams in
+        streamed_labels = set()
+        fields_by_label = {field.get('label'): field for field in structure.get("fields", [])}
+
+        def fill_streamed(label, value):
+            field = fields_by_label.get(label)
+            if field is None or label in streamed_labels:
+                return
+            streamed_labels.add(label)
+            planned = self._plan_field(field, value)
+            if planned:
+                self._fill_field(planned)
+
+        filled_data = self._generate_field_values(structure, candidate_data, on_answer=fill_streamed)
+        self.logger.debug(f"AI Fill Plan: {filled_data}")
+
+        # 3. Fill (whatever was not already filled while streaming)
+        self._fill_form(structure, filled_data, skip_labels=streamed_labels)
+
+        self.logger.info("Form filled successfully.")
+        return structure
+
+    def _submit_cache_key(self):
+        # Not '<domain>:...', so domain-prefix lookups for form structures never return it
+        return f"submit@{self._get_domain_key(self.driver.current_url)}"
+
+    def _analyze_submit_button(self):
+        """Asks the LLM about the page's buttons only: a much smaller prompt than the full form."""
+        buttons = self.driver.execute_script(_BUTTONS_JS, BUTTON_HTML_MAX_CHARS)
+        if not buttons:
+            return None
+        self.logger.info(f"Re-identifying the submit button among {len(buttons)} buttons...")
+        response = self.client.chat.completions.create(
+            model="gpt-4o-mini",
+            response_format={"type": "json_object"},
+            messages=[
+                {"role": "system", "content": SUBMIT_PROMPT},
+                {"role": "user", "content": "\n".join(buttons)}
+            ]
+        )
+        submit_info = orjson.loads(response.choices[0].message.content)
+        return submit_info if submit_info.get("selector") else None
+
+    def _resolve_submit_button(self, structure, submit_key):
+        """
+        The submit button is cached per domain separately from the fields, so a
+        changed button only costs a buttons-only LLM call, not a full re-analysis.
+        Tries the domain's last working button, then the form structure's.
+        """
+        for submit_info in (self.structure_cache.get(submit_key), structure.get("submit_button")):
+            if submit_info and submit_info.get("selector") and self._find_elements([submit_info["selector"]])[0]:
+                return submit_info
+
+        try:
+            submit_info = self._analyze_submit_button()
+        except Exception as e:
+            self.logger.error(f"Submit button analysis failed: {e}")
+            return None
+        if submit_info:
+            self.structure_cache.set(submit_key, submit_info)
+        return submit_info
+
+    def submit(self, structure):
+        """Pauses for a manual review of the filled form, then clicks submit."""
+        submit_key = self._submit_cache_key()
+        submit_info = self._resolve_submit_button(structure, submit_key)
+        if not submit_info or not submit_info.get("selector"):
+            self.logger.error("AI did not find a submit button. Pausing for manual submission.")
+            breakpoint() # Pause script for user
+            return True # Assume user submitted manually
+
+        submit_selector = submit_info.get("selector")
+        submit_text = submit_info.get("text", "N/A")
+
+        self.logger.info(f"Found submit button with text: '{submit_text}'")
+        self.logger.warning(">>> PAUSING FOR FINAL REVIEW. <<<")
+        self.logger.warning(f"Script will click button with selector: {submit_selector}")
+        self.logger.warning("Inspect the browser. If correct, type 'c' and [Enter] in your debugger to submit.")
+
+        breakpoint() # <-- SAFETY BREAKPOINT. Type 'c' to continue.
+
+        try:
+            submit_element = self.wait.until(
+                EC.element_to_be_clickable((By.CSS_SELECTOR, submit_selector))
+            )
+            self.driver.execute_script("arguments[0].click();", submit_element)
+            self.logger.info("--- SUBMITTED APPLICATION ---")
+            # Remember the button that worked for this domain
+            self.structure_cache.set(submit_key, submit_info)
+            time.sleep(5) # Wait for next page
+
+        except Exception as e:
+            self.logger.error(f"Failed to click submit button: {e}")
+            self.logger.error("Pausing for manual submission.")
+            breakpoint() # Pause if click fails
+
+        return True
 
     def apply(self, job_url, candidate_data):
         try:
-            self.logger.info(f"Navigating to job application: {job_url}")
-            self.driver.get(job_url)
-            self.wait.until(lambda d: d.execute_script('return document.readyState') == 'complete')
-            time.sleep(2) 
-            
-            # 1. Scrape & Analyze (or load cache)
-            html = self.driver.page_source
-            structure = self._analyze_page_structure(job_url, html)
-            
-            if not structure.get("fields"):
-                self.logger.error("Phase 1 Failed: AI did not return any fields to fill.")
+            structure = self.prepare(job_url, candidate_data)
+            if structure is None:
                 return False
-                
-            # 2. Generate Content
-            filled_data = self._generate_field_values(structure, candidate_data)
-            self.logger.debug(f"AI Fill Plan: {filled_data}")
-            
-            # 3. Fill
-            self._fill_form(structure, filled_data)
-            
-            self.logger.info("Form filled successfully.")
-
-            # --- *** NEW: SUBMIT LOGIC *** ---
-            submit_info = structure.get("submit_button")
-            if not submit_info or not submit_info.get("selector"):
-                self.logger.error("AI did not find a submit button. Pausing for manual submission.")
-                breakpoint() # Pause script for user
-                return True # Assume user submitted manually
-
-            submit_selector = submit_info.get("selector")
-            submit_text = submit_info.get("text", "N/A")
-
-            self.logger.info(f"Found submit button with text: '{submit_text}'")
-            self.logger.warning(">>> PAUSING FOR FINAL REVIEW. <<<")
-            self.logger.warning(f"Script will click button with selector: {submit_selector}")
-            self.logger.warning("Inspect the browser. If correct, type 'c' and [Enter] in your debugger to submit.")
-            
-            breakpoint() # <-- SAFETY BREAKPOINT. Type 'c' to continue.
+            return self.submit(structure)
+
+        except Exception as e:
+            self.logger.error(f"Generic Apply failed: {e}")
+            breakpoint() # Pause on any major error
+            return False
+
+
+class DriverPool:
+    """
+    A fixed set of warm Chrome instances handed out one job at a time, so
+    parallel applications never pay a browser cold start. Drivers passed in
+    (e.g. the scraper's) are reused but not quit by close().
+    """
+    def __init__(self, size, drivers=None):
+        self.drivers = list(drivers or [])[:size]
+        self.owned = [create_chrome_driver() for _ in range(size - len(self.drivers))]
+        self.drivers += self.owned
+        self._free = queue.Queue()
+        for driver in self.drivers:
+            self._free.put(driver)
+
+    @property
+    def size(self):
+        return len(self.drivers)
+
+    def acquire(self):
+        return self._free.get()
+
+    def release(self, driver):
+        # Drop the previous application page so it stops using memory and CPU
+        try:
+            driver.get("about:blank")
+        except Exception as e:
+            logging.warning(f"Could not reset driver before reuse: {e}")
+        self._free.put(driver)
 
+    def close(self):
+        for driver in self.owned:
             try:
-                submit_element = self.wait.until(
-                    EC.element_to_be_clickable((By.CSS_SELECTOR, submit_selector))
+                driver.quit()
+            except Exception as e:
+                logging.warning(f"Failed to quit driver: {e}")
+
+
+async def apply_many(driver_pool, openai_client, job_urls, candidate_data, structure_cache=None):
+    """
+    Applies to several jobs with one pooled browser per concurrent job.
+    Navigation, LLM analysis and form filling run in parallel worker threads,
+    forms that are ready at the same time get their answers from one gpt-4o
+    request, and the manual review and submit step takes one browser at a time.
+
+    Returns:
+        List[bool]: Result per job URL, in input order.
+    """
+    structure_cache = structure_cache if structure_cache is not None else StructureCache()
+    # Only as many jobs as there are browsers wait on the pool (each wait holds a worker thread)
+    slots = asyncio.Semaphore(driver_pool.size)
+    answer_q = asyncio.Queue()
+    review_lock = asyncio.Lock()
+
+    async def answer_batcher():
+        while (item := await answer_q.get()) is not None:
+            # Take whatever else is already waiting, so one request answers several forms
+            batch = [item]
+            while len(batch) < ANSWER_BATCH_SIZE:
+                try:
+                    next_item = answer_q.get_nowait()
+                except asyncio.QueueEmpty:
+                    break
+                if next_item is None:
+                    answer_q.put_nowait(None)
+                    break
+                batch.append(next_item)
+
+            applicator = batch[0][0]
+            try:
+                all_answers = await asyncio.to_thread(
+                    applicator._generate_field_values_many, [structure for _, structure, _ in batch], candidate_data
                 )
-                self.driver.execute_script("arguments[0].click();", submit_element)
-                self.logger.info("--- SUBMITTED APPLICATION ---")
-                time.sleep(5) # Wait for next page
-                
+                for (_, _, future), answers in zip(batch, all_answers):
+                    future.set_result(answers)
             except Exception as e:
-                self.logger.error(f"Failed to click submit button: {e}")
-                self.logger.error("Pausing for manual submission.")
-                breakpoint() # Pause if click fails
+                for _, _, future in batch:
+                    future.set_exception(e)
 
-            return True
-            
+    async def apply_with(applicator, job_url):
+        try:
+            structure = await asyncio.to_thread(applicator.load_and_analyse, job_url)
+            if structure is None:
+                return False
+
+            answers = asyncio.get_running_loop().create_future()
+            await answer_q.put((applicator, structure, answers))
+            filled_data = await answers
+            applicator.logger.debug(f"AI Fill Plan: {filled_data}")
+
+            await asyncio.to_thread(applicator._fill_form, structure, filled_data)
+            applicator.logger.info("Form filled successfully.")
+
+            async with review_lock:
+                return await asyncio.to_thread(applicator.submit, structure)
         except Exception as e:
-            self.logger.error(f"Generic Apply failed: {e}")
-            breakpoint() # Pause on any major error
+            applicator.logger.error(f"Generic Apply failed for {job_url}: {e}")
             return False
 
+    async def apply_one(job_url):
+        async with slots:
+            driver = await asyncio.to_thread(driver_pool.acquire)
+            try:
+                applicator = LLMGenericApplicator(driver, openai_client, structure_cache=structure_cache)
+                return await apply_with(applicator, job_url)
+            finally:
+                await asyncio.to_thread(driver_pool.release, driver)
+
+    batcher = asyncio.create_task(answer_batcher())
+    try:
+        return await asyncio.gather(*(apply_one(job_url) for job_url in job_urls))
+    finally:
+        await answer_q.put(None)
+        await batcher
+
 
 # ... inside your __main__ block ...
 
@@ -398,10 +939,12 @@ if __name__ == "__main__":
     #         not_easy_apply_jobs.append(result)
     
     
-    applicator = LLMGenericApplicator(agent.driver, agent.openai_client)
     not_easy_apply_jobs = ["https://jobs.lever.co/USMobile/7800a658-f3a0-4e5f-a023-4dcf23a6b449/apply?lever-source=LinkedIn&source=LinkedIn"]
-    for job in not_easy_apply_jobs:
-        applicator.apply(job, candidate_data)
-        
-        print("--> Paused. Please click 'Submit' manually, then press Enter.")
-        input()
\ No newline at end of file
+
+    # One warm browser per parallel application; the scraper's own driver is reused as the first
+    driver_pool = DriverPool(min(APPLY_WORKERS, len(not_easy_apply_jobs)), drivers=[agent.driver])
+    try:
+        results = asyncio.run(apply_many(driver_pool, agent.openai_client, not_easy_apply_jobs, candidate_data))
+        logging.info(f"Applied to {sum(results)}/{len(results)} jobs.")
+    finally:
+        driver_pool.close()
\ No newline at end of file
@@ -1,9 +1,10 @@
 from datetime import datetime
-import os
+import re
 from typing import List, Optional
 import urllib.parse
-from time import sleep
 
+import httpx
+from lxml import html as lxml_html
 from selenium.webdriver.common.by import By
 
 from .model import Country, JobPost, JobResponse, Location, ScraperInput
@@ -12,8 +13,92 @@ from .jobs import Job
 from .objects import Scraper
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import TimeoutException
 logger = create_logger(__name__)
 
+# Locators used inside the scroll loop, built once
+SCROLL_CONTAINER_LOCATOR = (By.CSS_SELECTOR, "div:has(> [data-results-list-top-scroll-sentinel])")
+JOB_CARD_LOCATOR = (By.CLASS_NAME, "job-card-container")
+
+
+# Reads the job cards under arguments[0] (default: the whole document) in one round-trip instead of several WebDriver calls per card.
+# Only cards not returned before on this page come back (ids remembered in window.__seen, which a
+# navigation resets), so each scroll step costs O(new cards) rather than O(cards in the DOM).
+# innerText (not textContent) matches what Selenium's .text returns.
+_JOB_CARDS_JS = """
+const seen = (window.__seen = window.__seen || new Set());
+const text = (el) => (el ? el.innerText.trim() : null);
+const cards = (arguments[0] || document).querySelectorAll('.job-card-container');
+const fresh = [];
+cards.forEach((c) => {
+  const id = c.getAttribute('data-job-id');
+  if (!id || seen.has(id)) return;
+  const a = c.querySelector('.job-card-container__link');
+  // Cards outside the viewport can be empty placeholders; pick them up once rendered
+  if (!a) return;
+  seen.add(id);
+  const meta = c.querySelector('.job-card-container__metadata-wrapper')
+            || c.querySelector('.job-card-container__metadata-item');
+  const time = c.querySelector('time');
+  fresh.push({
+    id: id,
+    url: a ? a.href : null,
+    title: text(a),
+    company: text(c.querySelector('.artdeco-entity-lockup__subtitle')),
+    location: text(meta),
+    datetime: time ? time.getAttribute('datetime') : null,
+  });
+});
+return {count: cards.length, fresh: fresh};
+"""
+
+# Explicit-wait budgets (seconds); waits return as soon as the condition holds.
+RECOMMENDED_JOBS_TIMEOUT = 10
+SEARCH_PAGE_TIMEOUT = 15
+SCROLL_LOAD_TIMEOUT = 2
+
+# Scrolls arguments[0] by one viewport and returns the new scrollTop (one round-trip)
+_SCROLL_STEP_JS = "const c = arguments[0]; c.scrollTop += c.clientHeight; return c.scrollTop;"
+# Card count only, instead of find_elements returning a reference to every card
+_CARD_COUNT_JS = "return arguments[0].querySelectorAll('.job-card-container').length;"
+
+# LinkedIn's guest endpoint behind the public job search: returns the result cards as a
+# server-rendered HTML fragment (~10 per 'start' offset), so listing needs no browser.
+GUEST_SEARCH_URL = "https://www.linkedin.com/jobs-guest/jobs/api/seeMoreJobPostings/search?"
+GUEST_SEARCH_TIMEOUT = 15
+_GUEST_CARD_XPATH = "//div[contains(concat(' ', normalize-space(@class), ' '), ' base-search-card ')]"
+_GUEST_LINK_XPATH = ".//a[contains(@class, 'base-card__full-link')]"
+_GUEST_TITLE_XPATH = "string(.//*[contains(@class, 'base-search-card__title')])"
+_GUEST_COMPANY_XPATH = "string(.//*[contains(@class, 'base-search-card__subtitle')])"
+_GUEST_LOCATION_XPATH = "string(.//*[contains(@class, 'job-search-card__location')])"
+
+# Shared by every card whose location can't be parsed (Location is frozen)
+DEFAULT_LOCATION = Location(country="worldwide")
+
+# Job id from a job link: /jobs/view/<id>/ (optionally with a title slug before it) or ?currentJobId=<id>
+_JOB_VIEW_ID_RE = re.compile(r"/jobs/view/(?:[^/?#]*-)?(\d+)")
+_CURRENT_JOB_ID_RE = re.compile(r"[?&]currentJobId=(\d+)")
+
+# Query parameters LinkedIn adds for tracking; they make the same job look like different URLs.
+TRACKING_PARAMS = {"trk", "trkinfo", "refid", "trackingid", "ebp", "lipi", "originalsubdomain"}
+
+
+def normalize_job_url(url: str) -> str:
+    """Drops tracking query params (trk, refId, trackingId, utm_* ...) and the fragment from a job URL."""
+    parsed = urllib.parse.urlparse(url)
+    query = [
+        (key, value)
+        for key, value in urllib.parse.parse_qsl(parsed.query)
+        if key.lower() not in TRACKING_PARAMS and not key.lower().startswith("utm_")
+    ]
+    return urllib.parse.urlunparse(parsed._replace(
+        scheme=parsed.scheme.lower(),
+        netloc=parsed.netloc.lower(),
+        query=urllib.parse.urlencode(query),
+        fragment="",
+    ))
+
+
 class JobSearch(Scraper):
     AREAS = ["recommended_jobs", None, "still_hiring", "more_jobs"]
 
@@ -28,6 +113,8 @@ class JobSearch(Scraper):
         super().__init__()
         self.driver = driver
         self.base_url = base_url
+        # URL joining, not a filesystem path: os.path.join would use '\\' on Windows
+        self._search_url_base = base_url.rstrip("/") + "/search?"
 
         if scrape:
             self.scrape(close_on_complete, scrape_recommended_jobs)
@@ -41,33 +128,16 @@ class JobSearch(Scraper):
         else:
             raise NotImplementedError("This part is not implemented yet")
 
-    def scrape_job_card(self, base_element) -> Job:
+    def scrape_job_card(self, card: dict) -> Job:
+        """Builds a Job from one card payload returned by _JOB_CARDS_JS."""
         try:
-            # Try to find job title and URL using updated selectors
-            job_link = base_element.find_element(
-                By.CLASS_NAME, "job-card-container__link"
-            )
-            job_title = job_link.text.strip()
-            linkedin_url = job_link.get_attribute("href")
-
-            # Find company name
-            company = base_element.find_element(
-                By.CLASS_NAME, "artdeco-entity-lockup__subtitle"
-            ).text.strip()
-
-            # Find location (try multiple possible selectors)
-            location = ""
-            try:
-                location = base_element.find_element(
-                    By.CLASS_NAME, "job-card-container__metadata-wrapper"
-                ).text.strip()
-            except:
-                try:
-                    location = base_element.find_element(
-                        By.CLASS_NAME, "job-card-container__metadata-item"
-                    ).text.strip()
-                except:
-                    location = "Location not found"
+            if not card.get("url") or not card.get("company"):
+                print("Error scraping job card: missing job link or company")
+                return None
+            job_title = card.get("title") or ""
+            linkedin_url = card["url"]
+            company = card["company"]
+            location = card.get("location") or "Location not found"
 
             job = Job(
                 linkedin_url=linkedin_url,
@@ -86,10 +156,15 @@ class JobSearch(Scraper):
         driver = self.driver
         driver.get(self.base_url)
         if scrape_recommended_jobs:
-            sleep(3)  # Wait for page to load
-
-            # Find recommended job cards directly
-            job_cards = driver.find_elements(By.CLASS_NAME, "job-card-container")
+            # Wait for recommended job cards to render, then read them all with one script call
+            job_cards = []
+            try:
+                WebDriverWait(driver, RECOMMENDED_JOBS_TIMEOUT).until(
+                    EC.presence_of_element_located(JOB_CARD_LOCATOR)
+                )
+                job_cards = (driver.execute_script(_JOB_CARDS_JS) or {}).get("fresh", [])
+            except TimeoutException:
+                pass
             print(f"Found {len(job_cards)} recommended jobs")
 
             recommended_jobs = []
@@ -106,67 +181,49 @@ class JobSearch(Scraper):
             driver.close()
         return
     
-    def scrape_job_card_detail(self, card):
+    def scrape_job_card_detail(self, card: dict) -> Optional[JobPost]:
+        """Builds a JobPost from one card payload returned by _JOB_CARDS_JS (no WebDriver calls)."""
         try:
-            try:
-                link_elem = card.find_element(By.CLASS_NAME, "job-card-container__link")
-                raw_url = link_elem.get_attribute("href")
-                job_url = raw_url.split("?")[0]
-                
-                # Attempt to extract ID from URL or Attribute
-                job_id = ""
-                if "view/" in job_url:
-                    job_id = job_url.split("view/")[-1].replace("/", "")
-                else:
-                    # Fallback: try to find data-job-id attribute often present in list items
-                    job_id = card.get_attribute("data-job-id")
-                
-                if not job_id:
-                    # Fallback: parse from query param if available
-                    parsed = urllib.parse.urlparse(raw_url)
-                    job_id = urllib.parse.parse_qs(parsed.query).get("currentJobId", [""])[0]
-
-            except Exception:
-                return None # Skip if no link/ID found
+            raw_url = card.get("url")
+            if not raw_url:
+                return None # Skip if no link found
+            job_url = normalize_job_url(raw_url)
+
+            # Job ID from the URL, then the card's data-job-id, then the currentJobId param
+            match = _JOB_VIEW_ID_RE.search(raw_url)
+            job_id = match.group(1) if match else card.get("id")
+            if not job_id:
+                match = _CURRENT_JOB_ID_RE.search(raw_url)
+                job_id = match.group(1) if match else ""
 
             # --- Extract Metadata ---
-            title = link_elem.text.strip()
-            
-            company = "Unknown"
-            try:
-                company = card.find_element(By.CLASS_NAME, "artdeco-entity-lockup__subtitle").text.strip()
-            except Exception as e:
-                logger.error(f"Error finding element: {e}")
-                pass
+            title = card.get("title") or ""
+            company = card.get("company") or "Unknown"
 
             # Location Parsing
-            location_obj = Location(country="worldwide")
+            location_obj = DEFAULT_LOCATION
             location_text = ""
-            try:
-                # Try finding the metadata wrapper or specific location class
-                metadata_div = card.find_element(By.CLASS_NAME, "job-card-container__metadata-wrapper")
-                location_text = metadata_div.text.split("\n")[0].strip() # Often the first line
-                
-                parts = location_text.split(", ")
+            if card.get("location"):
+                location_text = card["location"].split("\n")[0].strip() # Often the first line
+
+                # At most city, state, country (+ an ignored remainder)
+                parts = location_text.split(", ", 3)
                 if len(parts) == 2:
                     location_obj = Location(city=parts[0], state=parts[1], country="worldwide")
                 elif len(parts) >= 3:
                     location_obj = Location(city=parts[0], state=parts[1], country=parts[2])
                 else:
                     location_obj = Location(city=location_text, country="worldwide")
-            except Exception as e:
-                logger.error(f"Error finding element: {e}")
-                pass
 
             # Date Posted
             date_posted = None
-            try:
-                time_elem = card.find_element(By.TAG_NAME, "time")
-                datetime_str = time_elem.get_attribute("datetime")
-                if datetime_str:
-                    date_posted = datetime.strptime(datetime_str, "%Y-%m-%d")
-            except Exception:
-                pass
+            datetime_str = card.get("datetime")
+            # LinkedIn emits YYYY-MM-DD; fromisoformat parses that far faster than strptime
+            if datetime_str and len(datetime_str) == 10:
+                try:
+                    date_posted = datetime.fromisoformat(datetime_str)
+                except ValueError:
+                    pass
 
             # Remote Detection (heuristic based on text)
             is_remote = "remote" in title.lower() or "remote" in location_text.lower()
@@ -186,130 +243,223 @@ class JobSearch(Scraper):
             )
 
             return job_post
-            
 
         except Exception as e:
+            logger.error(f"Error parsing job card: {e}")
             return None
 
-    def search(self, scraper_input: ScraperInput) -> JobResponse:
+    @staticmethod
+    def _base_query(scraper_input: ScraperInput) -> str:
+        """
+        Encoded search parameters shared by every results page (everything but
+        'start'), ending in '&' so the page offset can be appended.
+        """
+        # Calculate seconds for date filtering
+        seconds_old = (
+            scraper_input.hours_old * 3600 if scraper_input.hours_old else None
+        )
+
+        # Build Parameters (Exact logic from reference)
+        base_params = {
+            "keywords": scraper_input.search_term,
+            "location": scraper_input.location,
+            "distance": scraper_input.distance,
+            "f_WT": 2 if scraper_input.is_remote else None,
+            "f_JT": (
+                job_type_code(scraper_input.job_type)
+                if scraper_input.job_type
+                else None
+            ),
+            "f_AL": "true" if scraper_input.easy_apply else None,
+            "f_C": (
+                ",".join(map(str, scraper_input.linkedin_company_ids))
+                if scraper_input.linkedin_company_ids
+                else None
+            ),
+            "f_E": ",".join(
+                experience_level_code(x) if x else ""
+                for x in scraper_input.experience_level 
+            )
+        }
+
+        # Handle Date Posted
+        if seconds_old is not None:
+            base_params["f_TPR"] = f"r{seconds_old}"
+
+        # Remove None values
+        base_params = {k: v for k, v in base_params.items() if v is not None}
+        query = urllib.parse.urlencode(base_params)
+        return f"{query}&" if query else ""
+
+    @staticmethod
+    def parse_guest_cards(fragment: str) -> List[dict]:
+        """Card payloads (same shape as _JOB_CARDS_JS returns) from a guest search fragment."""
+        cards = []
+        for node in lxml_html.fromstring(fragment).xpath(_GUEST_CARD_XPATH):
+            links = node.xpath(_GUEST_LINK_XPATH)
+            if not links:
+                continue
+            times = node.xpath(".//time")
+            cards.append({
+                "id": (node.get("data-entity-urn") or "").rpartition(":")[2] or None,
+                "url": links[0].get("href"),
+                "title": node.xpath(_GUEST_TITLE_XPATH).strip(),
+                "company": node.xpath(_GUEST_COMPANY_XPATH).strip(),
+                "location": node.xpath(_GUEST_LOCATION_XPATH).strip(),
+                "datetime": times[0].get("datetime") if times else None,
+            })
+        return cards
+
+    def search_guest(
+        self,
+        scraper_input: ScraperInput,
+        seen_ids: Optional[set] = None,
+        user_agent: Optional[str] = None,
+    ) -> JobResponse:
+        """
+        Same search as `search`, but through the logged-out guest endpoint over plain
+        HTTP: no page load, rendering or scrolling. Returns an empty response (so the
+        caller can fall back to the browser) when LinkedIn refuses the request.
+        """
+        seen_ids = set() if seen_ids is None else seen_ids
+        job_list: JobResponse = JobResponse(jobs=[])
+        seen_urls = set()
+        start = scraper_input.offset // 10 * 10 if scraper_input.offset else 0
+        search_url_prefix = GUEST_SEARCH_URL + self._base_query(scraper_input)
+        headers = {"User-Agent": user_agent} if user_agent else {}
+
+        logger.info(f"Starting guest search for keywords: {scraper_input.search_term}")
+        with httpx.Client(headers=headers, timeout=GUEST_SEARCH_TIMEOUT, follow_redirects=True) as client:
+            while len(job_list.jobs) < scraper_input.results_wanted and start < 1000:
+                try:
+                    response = client.get(f"{search_url_prefix}start={start}")
+                    response.raise_for_status()
+                except httpx.HTTPError as e:
+                    logger.warning(f"Guest search request failed: {e}")
+                    break
+                if not response.text.strip():
+                    break
+                cards = self.parse_guest_cards(response.text)
+                if not cards:
+                    break
+
+                for card in cards:
+                    job_id = card["id"]
+                    if job_id and job_id in seen_ids:
+                        continue
+                    job_post = self.scrape_job_card_detail(card)
+                    if job_id:
+                        seen_ids.add(job_id)
+                    if job_post and job_post.job_url not in seen_urls:
+                        seen_urls.add(job_post.job_url)
+                        job_list.jobs.append(job_post)
+                start += len(cards)
+
+        logger.info(f"Guest search complete. Found {len(job_list.jobs)} jobs.")
+        job_list.jobs = job_list.jobs[:scraper_input.results_wanted]
+        return job_list
+
+    def search(self, scraper_input: ScraperInput, seen_ids: Optional[set] = None) -> JobResponse:
         """
         Searches for jobs using Selenium, mirroring the logic of the Requests-based 
         scraper for parameter building and pagination, returning JobPost objects.
+
+        `seen_ids` are job ids to skip before any per-card work. The set is updated in
+        place with every id this search reads, so one set can be shared across searches.
         """
+        # Every wait in the search is explicit; with the driver's implicit wait left on,
+        # each find_elements that legitimately matches nothing would block for the full timeout.
+        previous_implicit_wait = self.driver.timeouts.implicit_wait
+        self.driver.implicitly_wait(0)
+        try:
+            return self._search_pages(scraper_input, set() if seen_ids is None else seen_ids)
+        finally:
+            self.driver.implicitly_wait(previous_implicit_wait)
+
+    def _search_pages(self, scraper_input: ScraperInput, seen_ids: set) -> JobResponse:
         job_list: JobResponse = JobResponse(jobs=[])
-        seen_ids = set()
+        # seen_ids is shared across pages (and searches): LinkedIn repeats the same job on later pages and in rails
+        seen_urls = set()
         
         # Initialize offset (LinkedIn uses 'start' parameter for pagination)
         start = scraper_input.offset // 10 * 10 if scraper_input.offset else 0
         request_count = 0
         
-        # Calculate seconds for date filtering
-        seconds_old = (
-            scraper_input.hours_old * 3600 if scraper_input.hours_old else None
-        )
-
         # Loop condition: continue until we have enough results or hit a safety limit
         continue_search = (
             lambda: len(job_list.jobs) < scraper_input.results_wanted and start < 1000
         )
 
+        search_url_prefix = self._search_url_base + self._base_query(scraper_input)
+
         logger.info(f"Starting search for keywords: {scraper_input.search_term}")
 
+        # Waits and conditions are stateless, so one of each serves every page and scroll step
+        wait = WebDriverWait(self.driver, SEARCH_PAGE_TIMEOUT)
+        scroll_wait = WebDriverWait(self.driver, SCROLL_LOAD_TIMEOUT)
+        container_present = EC.presence_of_element_located(SCROLL_CONTAINER_LOCATOR)
+        card_present = EC.presence_of_element_located(JOB_CARD_LOCATOR)
+        # Local alias for the hot loop
+        execute_script = self.driver.execute_script
+
         while continue_search():
             request_count += 1
             logger.info(
                 f"Search page: {request_count} | Collected: {len(job_list.jobs)}/{scraper_input.results_wanted}"
             )
 
-            # 1. Build Parameters (Exact logic from reference)
-            params = {
-                "keywords": scraper_input.search_term,
-                "location": scraper_input.location,
-                "distance": scraper_input.distance,
-                "f_WT": 2 if scraper_input.is_remote else None,
-                "f_JT": (
-                    job_type_code(scraper_input.job_type)
-                    if scraper_input.job_type
-                    else None
-                ),
-                "start": start,
-                "f_AL": "true" if scraper_input.easy_apply else None,
-                "f_C": (
-                    ",".join(map(str, scraper_input.linkedin_company_ids))
-                    if scraper_input.linkedin_company_ids
-                    else None
-                ),
-                "f_E": ",".join(
-                    experience_level_code(x) if x else ""
-                    for x in scraper_input.experience_level 
-                )
-            }
-
-            # Handle Date Posted
-            if seconds_old is not None:
-                params["f_TPR"] = f"r{seconds_old}"
-
-            # Remove None values
-            params = {k: v for k, v in params.items() if v is not None}
-
             # 2. Construct URL
-            query_string = urllib.parse.urlencode(params)
-            search_url = os.path.join(self.base_url, "search") + f"?{query_string}"
+            search_url = f"{search_url_prefix}start={start}"
             
-            scraped_jobs_data = []
-            # This set will track job IDs we've already processed
-            scraped_job_ids = set()
             # 3. Navigate with Selenium
             try:
                 jobs_on_page = 0
                 self.driver.get(search_url)
-                sleep(10)
-                wait = WebDriverWait(self.driver, 10)
 
-                # 1. Find the scrollable container
-                scrollable_container_selector = (
-                    By.CSS_SELECTOR, "div:has(> [data-results-list-top-scroll-sentinel])"
-                )
-                scrollable_container = wait.until(
-                    EC.presence_of_element_located(scrollable_container_selector)
-                )
+                # 1. Find the scrollable container, then wait for the first card
+                scrollable_container = wait.until(container_present)
+                try:
+                    wait.until(card_present)
+                except TimeoutException:
+                    logger.info("No job cards rendered on this page.")
+
+                # Reads cards_before at call time, so it is built once per page
+                def more_cards_loaded(_):
+                    return execute_script(_CARD_COUNT_JS, scrollable_container) > cards_before
+
                 last_scroll_top = -1
                 while True:
-                    # Find all cards *currently* in the DOM
-                    current_cards_in_dom = scrollable_container.find_elements(
-                        By.CLASS_NAME, "job-card-container"
-                    )                    
-                    if not current_cards_in_dom:
+                    # Read the cards that appeared since the last step in a single script call
+                    snapshot = execute_script(_JOB_CARDS_JS, scrollable_container) or {}
+                    cards_in_dom = snapshot.get("count", 0)
+                    if not cards_in_dom:
                         logger.warning("No job cards found in container.")
                         break
+                    jobs_on_page = max(jobs_on_page, cards_in_dom)
                     
                     new_cards_found = 0
-                    for card in current_cards_in_dom:
-                        try:
-                            jobs_on_page += 1
-                            job_id = card.get_attribute("data-job-id")
-                
-                            # Check if we've already processed this job ID
-                            if job_id and job_id not in scraped_job_ids:
-                                scraped_job_ids.add(job_id)
-                                new_cards_found += 1
-                                job_post = self.scrape_job_card_detail(card)
-                                if job_post:
-                                    job_list.jobs.append(job_post)
-                        except Exception as e:
-                            logger.error(f"Error scraping a job card: {e}")           
-
-                    self.driver.execute_script(
-                        "arguments[0].scrollTop += arguments[0].clientHeight;", 
-                        scrollable_container
-                    )
+                    for card in snapshot.get("fresh", []):
+                        job_id = card["id"]
+            
+                        # The same job can reappear on later pages and in other rails
+                        if job_id not in seen_ids:
+                            seen_ids.add(job_id)
+                            new_cards_found += 1
+                            job_post = self.scrape_job_card_detail(card)
+                            if job_post and job_post.job_url not in seen_urls:
+                                seen_urls.add(job_post.job_url)
+                                job_list.jobs.append(job_post)
+
+                    current_scroll_top = execute_script(_SCROLL_STEP_JS, scrollable_container)
                     
-                    sleep(3) # Adjust this sleep as needed
+                    # Continue as soon as more cards are loaded (short fallback at the bottom)
+                    cards_before = cards_in_dom
+                    try:
+                        scroll_wait.until(more_cards_loaded)
+                    except TimeoutException:
+                        pass
                     
-                    # 6. Check if we are at the bottom
-                    current_scroll_top = self.driver.execute_script(
-                        "return arguments[0].scrollTop;", scrollable_container
-                    )
+                    # 6. Check if we are at the bottom (scrolling no longer moves the list)
                     if current_scroll_top == last_scroll_top:
                         logger.info(f"Reached the end of the list. Total jobs scraped: {new_cards_found}")
                         break
@@ -326,7 +476,6 @@ class JobSearch(Scraper):
                 break
                 
             start += 25
-            sleep(2)
 
         logger.info(f"Search complete. Found {len(job_list.jobs)} jobs.")
         job_list.jobs = job_list.jobs[:scraper_input.results_wanted]
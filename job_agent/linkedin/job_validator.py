@@ -1,5 +1,19 @@
+import asyncio
+import html
+import importlib.util
+from itertools import compress
 import json
+import random
+import re
+import textwrap
+import time
 
+import httpx
+import numpy as np
+import orjson
+import tiktoken
+from job_agent.linkedin.cache import EmbeddingCache, FitCache
+from job_agent.linkedin.rate_limit import TokenBucket
 from job_agent.linkedin.util import extract_pdf_text
 import os
 import pandas as pd
@@ -15,20 +29,30 @@ logger = logging.getLogger(__name__)
 
     
     
-def filter_new_jobs(scraped_jobs: List[JobPost], existing_df: pd.DataFrame) -> List[JobPost]:
-    if existing_df.empty:
-         logger.info("Sheet is empty. All scraped jobs are new.")
-         return scraped_jobs
-     
-    if 'id' not in existing_df.columns:
-        logger.warning("No 'id' column found in the sheet. Assuming all scraped jobs are new.")
-        return scraped_jobs
-    existing_ids = set(existing_df['id'].dropna().astype(str))
-    logger.info(f"Loaded {len(existing_ids)} existing job IDs from the sheet.")
+def existing_job_ids(existing_df: pd.DataFrame) -> frozenset:
+    """Job IDs already in the sheet, as strings. Build once and pass to filter_new_jobs."""
+    if existing_df.empty or 'id' not in existing_df.columns:
+        return frozenset()
+    return frozenset(existing_df['id'].dropna().astype(str).values)
+
+
+def filter_new_jobs(scraped_jobs: List[JobPost], existing_df: Optional[pd.DataFrame] = None,
+                    existing_ids: Optional[frozenset] = None) -> List[JobPost]:
+    if existing_ids is None:
+        if existing_df is None or existing_df.empty:
+            logger.info("Sheet is empty. All scraped jobs are new.")
+            return scraped_jobs
+
+        if 'id' not in existing_df.columns:
+            logger.warning("No 'id' column found in the sheet. Assuming all scraped jobs are new.")
+            return scraped_jobs
+        existing_ids = existing_job_ids(existing_df)
+        logger.info(f"Loaded {len(existing_ids)} existing job IDs from the sheet.")
 
     new_jobs = []
     for job in scraped_jobs:
-        if job.id and str(job.id) not in existing_ids:
+        # JobPost.id is already a string
+        if job.id and job.id not in existing_ids:
             new_jobs.append(job)
         elif not job.id:
              logger.warning(f"Scraped job '{job.title}' has no ID. Skipping.")
@@ -36,6 +60,52 @@ def filter_new_jobs(scraped_jobs: List[JobPost], existing_df: pd.DataFrame) -> L
     logger.info(f"Found {len(new_jobs)} new jobs out of {len(scraped_jobs)} scraped.")
     return new_jobs
 
+
+# --- Title pre-filter (before any job page is fetched) ---
+# Title words that rule a job out for the CV on their own.
+TITLE_BLOCKLIST = frozenset({
+    "intern", "internship", "php", "wordpress", "drupal", "salesforce", "recruiter", "sales",
+})
+_TITLE_WORD_RE = re.compile(r"[a-z0-9+#]+")
+
+
+def _singular(word: str) -> str:
+    """Drops one plural 's' ("engineers" -> "engineer"), leaving "business" and "class" whole."""
+    word = word.casefold()
+    return word[:-1] if word.endswith("s") and not word.endswith("ss") else word
+
+
+def _word_pattern(words) -> re.Pattern:
+    """
+    One case-insensitive alternation matching any of `words` as a whole word, plural
+    's' optional, so each title is screened by a single regex search.
+    """
+    # Plurals folded so "Engineers" matches the keyword "Engineer"
+    stems = {_singular(word) for word in words} - {""}
+    # Longest first, so "ai" never shadows a longer word at the same position
+    # (?!) never matches, for an empty word list
+    alternation = "|".join(map(re.escape, sorted(stems, key=len, reverse=True))) or "(?!)"
+    return re.compile(rf"(?<![a-z0-9+#])(?:{alternation})s?(?![a-z0-9+#])", re.IGNORECASE)
+
+
+def filter_relevant_titles(jobs: List[JobPost], keywords: List[str],
+                           blocklist: frozenset = TITLE_BLOCKLIST) -> List[JobPost]:
+    """
+    Drops jobs whose card title has a blocklisted word or shares no word with any
+    search keyword, so their pages are never downloaded or sent to the LLM.
+    Blocklisted words that are part of a search keyword ("Sales Engineer") are allowed.
+    """
+    keyword_words = _TITLE_WORD_RE.findall(" ".join(keywords).casefold())
+    keyword_stems = {_singular(word) for word in keyword_words}
+    blocked = _word_pattern(word for word in blocklist if _singular(word) not in keyword_stems).search
+    relevant_to_search = _word_pattern(keyword_words).search
+    relevant = [
+        job for job in jobs
+        if job.title and not blocked(job.title) and relevant_to_search(job.title)
+    ]
+    logger.info(f"Title pre-filter kept {len(relevant)} of {len(jobs)} jobs.")
+    return relevant
+
     
 def filter_new_companies(scraped_jobs: list[dict], existing_df: pd.DataFrame) -> list[dict]:
     if existing_df.empty:
@@ -45,36 +115,237 @@ def filter_new_companies(scraped_jobs: list[dict], existing_df: pd.DataFrame) ->
     if 'company_name' not in existing_df.columns:
         logger.warning("No 'company_name' column found in the sheet. Assuming all scraped jobs are new.")
         return scraped_jobs
-    existing_companies = set(existing_df['company_name'].dropna().astype(str))
-    logger.info(f"Loaded {len(existing_companies)} existing job companies from the sheet.")
+    existing_companies = existing_df['company_name'].dropna().astype("string")
+    logger.info(f"Loaded {existing_companies.nunique()} existing job companies from the sheet.")
 
-    new_companies = []
-    for job in scraped_jobs:
-        if job['company_name'] and str(job['company_name']) not in existing_companies:
-            new_companies.append(job)
-        elif not job['company_name']:
-             logger.warning(f"Scraped job '{job['job_id']}' has no c. Skipping.")
+    # Vectorised membership test instead of a str() + set lookup per job
+    names = pd.Series([job['company_name'] for job in scraped_jobs], dtype="string")
+    missing = names.fillna("").eq("").to_numpy(dtype=bool)
+    is_new = ~missing & ~names.isin(existing_companies).to_numpy(dtype=bool)
+    for job in compress(scraped_jobs, missing):
+        logger.warning(f"Scraped job '{job['job_id']}' has no company name. Skipping.")
+    new_companies = list(compress(scraped_jobs, is_new))
 
     logger.info(f"Found {len(new_companies)} new jobs out of {len(scraped_jobs)} scraped.")
     return new_companies
 
 # Add this new function to your JobScraperAgent class
 
+# --- OpenAI request budget ---
+# Published gpt-4o-mini limits for our account tier. We stay a little under them
+# so bursts from the parallel validator don't trip 429s.
+FACTS_MODEL = "gpt-4o-mini"
+# Bump whenever the facts prompt/schema changes so cached answers are not reused.
+PROMPT_VERSION = 4
+
+
+def _strict_object(properties: dict) -> dict:
+    # Structured Outputs strict mode: every property required, nothing else allowed
+    return {"type": "object", "properties": properties, "required": list(properties), "additionalProperties": False}
+
+
+_STRINGS = {"type": "array", "items": {"type": "string"}}
+# Typed schema for one facts answer. The API constrains decoding to it, so responses always
+# parse and carry every key; the prompt still describes what each field means.
+FACTS_SCHEMA = _strict_object({
+    "is_fit": {"type": "boolean"},
+    "reason": {"type": "string"},
+    "confidence_score": {"type": "number"},
+    "experience_min": {"type": ["integer", "null"]},
+    "experience_preferred": {"type": ["integer", "null"]},
+    "required_skills": _STRINGS,
+    "nice_to_have_skills": _STRINGS,
+    "missing_skills": _STRINGS,
+    "skill_matching_percentage": {"type": "integer"},
+    "work_model": {"type": "string", "enum": ["remote", "hybrid", "on-site", "unknown"]},
+    "geographic_restrictions": _STRINGS,
+    "is_geography_valid": {"type": "boolean"},
+    "timezone_restriction": {"type": ["string", "null"]},
+    "does_hired_from_africa": {"type": "boolean"},
+    "does_hired_from_ethiopia": {"type": "boolean"},
+    "relocation_offered": {"type": "boolean"},
+    "visa_sponsorship": {"type": "boolean"},
+    "salary_min": {"type": ["integer", "null"]},
+    "salary_max": {"type": ["integer", "null"]},
+    "salary_currency": {"type": ["string", "null"]},
+    "is_company_legit": {"type": "boolean"},
+    "is_job_post_legit": {"type": "boolean"},
+    "red_flags": _STRINGS,
+})
+FACTS_RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {"name": "job_facts", "strict": True, "schema": FACTS_SCHEMA},
+}
+MULTI_FACTS_RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "job_facts_list", "strict": True,
+        "schema": _strict_object({"results": {"type": "array", "items": FACTS_SCHEMA}}),
+    },
+}
+# How much of the job description is sent to the model (and keyed in the fit cache).
+# Trimmed by tokens; the character limit is the fallback when no tokenizer is
+# available, and the embedding input size.
+JD_PROMPT_TOKENS = 1500
+JD_PROMPT_CHARS = 6000
+# Description clean-up before trimming: tags, entities and runs of whitespace cost tokens
+# without telling the model anything.
+_HTML_TAG_RE = re.compile(r"<[^>]+>")
+_INLINE_SPACE_RE = re.compile(r"[ \t\u00a0]+")
+_BLANK_LINES_RE = re.compile(r" *\n\s*\n\s*")
+# Start of a legal/EEO footer. Only cut when it sits in the second half of the text,
+# so a JD that opens with an EEO line keeps its body.
+_BOILERPLATE_RE = re.compile(
+    r"^.{0,80}?\b(?:is an? equal (?:employment )?opportunity|equal (?:employment )?opportunity employer|"
+    r"eeo statement|privacy (?:notice|policy)|reasonable accommodations?|e-verify)\b",
+    re.IGNORECASE | re.MULTILINE
+)
+MAX_REQUESTS_PER_MINUTE = 450
+MAX_TOKENS_PER_MINUTE = 180_000
+# Rough size of the JSON answer, reserved from the token budget up front.
+EXPECTED_COMPLETION_TOKENS = 600
+MAX_ATTEMPTS = 5
+# One pooled, keep-alive HTTP client per OpenAI client, so bursts of requests reuse
+# connections instead of paying a TLS handshake each. HTTP/2 (one multiplexed
+# connection) is used when the optional 'h2' package is installed (httpx[http2]).
+OPENAI_HTTP2 = importlib.util.find_spec("h2") is not None
+OPENAI_HTTP_LIMITS = httpx.Limits(max_keepalive_connections=32, max_connections=64)
+OPENAI_HTTP_TIMEOUT = 60.0
+# Chat requests in flight at once. The buckets cap the rate; this caps open
+# connections so a large backlog doesn't fire hundreds of requests at once.
+MAX_CONCURRENT_REQUESTS = 20
+# Job descriptions packed into one chat request. Small enough that the
+# combined JSON answer stays well inside the output token limit.
+JOBS_PER_REQUEST = 4
+
+# --- Embedding pre-filter ---
+# Jobs whose description is clearly unrelated to the CV skip the LLM call.
+# text-embedding-3-small cosines sit in a compressed range (related texts are
+# often ~0.4-0.6), so the cut-off is deliberately low to only drop obvious misfits.
+EMBEDDING_MODEL = "text-embedding-3-small"
+MIN_CV_SIMILARITY = 0.35
+# Inputs per embeddings request; keeps each request well under the per-request token cap.
+EMBEDDING_BATCH_SIZE = 100
+
+# --- Keyword pre-filter ---
+# Hard requirements stated plainly in the JD reject a job without any API call.
+# Matches "5+ years of experience", "7-10 years of relevant experience", "6 years' backend experience".
+_EXPERIENCE_YEARS_RE = re.compile(
+    r"\b(\d{1,2})\s*\+?\s*(?:(?:-|–|to)\s*\d{1,2}\s*\+?\s*)?years?'?\s+(?:of\s+)?(?:[\w/-]+\s+){0,3}?experience",
+    re.IGNORECASE
+)
+# Rejected only if every stated requirement exceeds the candidate's years by more than this,
+# so "3+ years of Python experience, 8 years overall" still goes to the LLM.
+QUICK_REJECT_YEARS_MARGIN = 2
+_GEO_RESTRICTION_RE = re.compile(
+    r"\b(?:(?-i:US)[- ](?:only|citizens? only)|must be (?:a )?(?-i:US) citizen|(?:EEA|EU) only)\b",
+    re.IGNORECASE
+)
+_CLEARANCE_RE = re.compile(
+    r"\b(?:(?:security )?clearance (?:is )?required|"
+    r"(?:active|current) (?:(?-i:TS/SCI|TS|SC|DV)|top secret|secret|security) clearance|"
+    r"must (?:hold|have|possess|obtain) (?:an? )?(?:active )?(?:security )?clearance)\b",
+    re.IGNORECASE
+)
+# Only a disqualifier when the candidate wants remote work.
+_ONSITE_ONLY_RE = re.compile(
+    r"\b(?:on-?site only|(?:this|the) (?:is an? )?(?:role|position) is (?:fully |100% )?on-?site|"
+    r"not (?:a |open to )?remote(?! ?-?first)\b|no remote (?:work|options?)\b|remote work is not)",
+    re.IGNORECASE
+)
+# Checked in order; the first match is the rejection reason.
+_HARD_DISQUALIFIERS = (
+    (_GEO_RESTRICTION_RE, "location restricted"),
+    (_CLEARANCE_RE, "security clearance required"),
+)
+
+# --- Batch API (overnight runs) ---
+BATCH_COMPLETION_WINDOW = "24h"
+BATCH_POLL_INITIAL_DELAY = 30
+BATCH_POLL_MAX_DELAY = 600
+BATCH_TERMINAL_STATUSES = {"completed", "failed", "expired", "cancelled"}
+
+DEFAULT_VALIDATION_DATA = {
+    'experience_years': 3,
+    'is_remote': True,
+    'max_salary': 100000,
+    'work_model': 'remote',
+    'max_applicants_count': 300
+}
+
+
 class JobValidator:
     def __init__(self, cv_summary:str):
         self.cv_summary = cv_summary
-        self.openai_client = openai.OpenAI(api_key=os.environ.get("OPENAI_API_KEY", ""))
-    
-    def get_job_facts(self, job_details: dict) -> Optional[dict]:
-        """
-        Uses GPT-4o-mini to analyze the job description and extract a rich
-        JSON object of facts for later validation.
-        """
-        job_description_text = job_details.get("description")
-        if not job_description_text:
-            logging.warning(f"No description found for job {job_details.get('job_id')}, skipping AI analysis.")
+        self.openai_client = openai.OpenAI(
+            api_key=os.environ.get("OPENAI_API_KEY", ""),
+            http_client=httpx.Client(http2=OPENAI_HTTP2, limits=OPENAI_HTTP_LIMITS, timeout=OPENAI_HTTP_TIMEOUT)
+        )
+        self.fit_cache = FitCache()
+        # Shared by every async call made through this validator
+        self.request_bucket = TokenBucket(MAX_REQUESTS_PER_MINUTE, name="requests")
+        self.token_bucket = TokenBucket(MAX_TOKENS_PER_MINUTE, name="tokens")
+        self._request_slots: Optional[asyncio.Semaphore] = None
+        self._request_slots_loop = None
+        # Built once per validator instead of once per job
+        self._system_prompt = self._facts_system_prompt()
+        self._multi_system_prompt = self._facts_system_prompt(multi_job=True)
+        self._encoder = self._load_encoder()
+        self.embedding_cache = EmbeddingCache()
+        self.cv_embedding = self._embed_cv()
+
+    def _embed_cv(self) -> Optional[np.ndarray]:
+        key = EmbeddingCache.make_key(EMBEDDING_MODEL, self.cv_summary)
+        cached = self.embedding_cache.get(key)
+        if cached is not None:
+            return np.array(cached)
+        try:
+            response = self.openai_client.embeddings.create(model=EMBEDDING_MODEL, input=self.cv_summary)
+            embedding = response.data[0].embedding
+            self.embedding_cache.set(key, embedding)
+            return np.array(embedding)
+        except Exception as e:
+            logger.warning(f"Could not embed CV, similarity pre-filter disabled: {e}")
+            return None
+
+    def _load_encoder(self):
+        try:
+            return tiktoken.encoding_for_model(FACTS_MODEL)
+        except Exception as e:
+            # The encoding file is downloaded on first use; _count_tokens falls back to ~4 chars per token
+            logger.warning(f"tiktoken unavailable, estimating tokens from length: {e}")
             return None
 
+    def _cache_key(self, job_details: dict) -> str:
+        job_description_text = job_details.get("description") or ""
+        return FitCache.make_key(FACTS_MODEL, PROMPT_VERSION, self.cv_summary, self._trim_description(job_description_text))
+
+    @staticmethod
+    def _clean_description(job_description_text: str) -> str:
+        """Strips HTML, entities, repeated whitespace and a trailing legal/EEO footer."""
+        text = html.unescape(_HTML_TAG_RE.sub(" ", job_description_text))
+        text = _BLANK_LINES_RE.sub("\n\n", _INLINE_SPACE_RE.sub(" ", text)).strip()
+        footer = _BOILERPLATE_RE.search(text)
+        if footer and footer.start() > len(text) // 2:
+            text = text[:footer.start()].rstrip()
+        return text
+
+    def _trim_description(self, job_description_text: str) -> str:
+        """Cleans the job description and cuts it to JD_PROMPT_TOKENS tokens, so every prompt has a predictable size."""
+        job_description_text = self._clean_description(job_description_text)
+        if self._encoder is None:
+            return job_description_text[:JD_PROMPT_CHARS]
+        token_ids = self._encoder.encode(job_description_text)
+        if len(token_ids) <= JD_PROMPT_TOKENS:
+            return job_description_text
+        return self._encoder.decode(token_ids[:JD_PROMPT_TOKENS])
+
+    def _cache_facts(self, job_details: dict, job_data: Optional[dict]) -> Optional[dict]:
+        if job_data:
+            self.fit_cache.set(self._cache_key(job_details), job_data)
+        return job_data
+    
+    def _facts_system_prompt(self, multi_job: bool = False) -> str:
         # This is the "schema" we want the AI to fill
         json_schema = {
             "is_fit": "boolean",
@@ -102,11 +373,21 @@ class JobValidator:
             "red_flags": ["list", "of", "red", "flags", "found", "in", "text", "any red flags you know about the company"]
         }
 
-        system_prompt = f"""
+        if multi_job:
+            response_format = (
+                'Respond ONLY with a valid JSON object of the form {"results": [...]}, with one analysis '
+                'per job description, in the order given. Each analysis must match this exact structure:'
+            )
+        else:
+            response_format = "Respond ONLY with a valid JSON object matching this exact structure:"
+
+        # Dedented and with a compact schema: the prompt is sent with every request,
+        # and indentation is billed as input tokens like everything else.
+        return textwrap.dedent(f"""
         You are an expert HR recruitment assistant. Your task is to analyze a job description (JD)
         against a candidate's CV summary.
-        Respond ONLY with a valid JSON object matching this exact structure:
-        {json.dumps(json_schema, indent=4)}
+        {response_format}
+        {json.dumps(json_schema, separators=(",", ":"))}
 
         Here are the rules for your analysis:
         1.  **is_fit**: Set to 'true' ONLY IF the job is a good match based on the candidate's CV and preferences (remote-first, AI/ML roles).
@@ -114,8 +395,15 @@ class JobValidator:
         3.  **missing_skills**: Be strict. Compare the JD's 'required_skills' to the CV and list what is NOT in the CV.
         4.  **geographic_restrictions**: Be thorough. Find *any* mention of location. If it says "Remote" with no other text, this list should be empty. If it says "Remote (US)", add "US Only".
         5.  **red_flags**: Look for scam-like text, crypto, vague JDs, or personal email addresses.
-        """
-        
+        """).strip()
+
+    def _build_messages(self, job_details: dict) -> Optional[List[dict]]:
+        """Builds the chat messages for the job facts prompt, or None if the job has no description."""
+        job_description_text = job_details.get("description")
+        if not job_description_text:
+            logging.warning(f"No description found for job {job_details.get('job_id')}, skipping AI analysis.")
+            return None
+
         user_prompt = f"""
         Candidate CV Summary:
         ---
@@ -123,90 +411,490 @@ class JobValidator:
         ---
         Job Description (from Job ID {job_details.get('job_id')}):
         ---
-        {job_description_text[:6000]}
+        {self._trim_description(job_description_text)}
         ---
         Analyze the fit and provide your JSON response.
         """
 
+        return [
+            {"role": "system", "content": self._system_prompt},
+            {"role": "user", "content": user_prompt}
+        ]
+
+    def _build_multi_messages(self, job_details_list: List[dict]) -> List[dict]:
+        """Builds one prompt covering several jobs; the CV and instructions are sent once."""
+        job_blocks = "\n".join(
+            f"---JOB {number}--- (Job ID {job.get('job_id')})\n{self._trim_description(job['description'])}"
+            for number, job in enumerate(job_details_list, start=1)
+        )
+        user_prompt = f"""
+        Candidate CV Summary:
+        ---
+        {self.cv_summary}
+        ---
+        Job Descriptions:
+        {job_blocks}
+        ---
+        Analyze the fit of each job and provide your JSON response with exactly {len(job_details_list)} results, in input order.
+        """
+
+        return [
+            {"role": "system", "content": self._multi_system_prompt},
+            {"role": "user", "content": user_prompt}
+        ]
+
+    def _parse_facts(self, result_json_str: Optional[str]) -> Optional[dict]:
+        if not result_json_str:
+            return None
         try:
-            response = self.openai_client.chat.completions.create(
-                model="gpt-4o-mini",
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_prompt}
-                ],
-                response_format={"type": "json_object"}
-            )
-            
-            result_json_str = response.choices[0].message.content
-            if result_json_str:
-                return json.loads(result_json_str)
-        
-        except json.JSONDecodeError as e:
+            return orjson.loads(result_json_str)
+        except orjson.JSONDecodeError as e:
             logging.error(f"Failed to parse JSON response from AI: {e}\nResponse: {result_json_str}")
             return None
+
+    def _count_tokens(self, messages: List[dict]) -> int:
+        """Estimates the prompt size so the rate limiter can reserve tokens before sending."""
+        if self._encoder is None:
+            return sum(len(m["content"]) // 4 + 4 for m in messages)
+        # ~4 tokens of per-message framing on top of the content
+        return sum(len(self._encoder.encode(m["content"])) + 4 for m in messages)
+
+    def get_job_facts(self, job_details: dict) -> Optional[dict]:
+        """
+        Uses GPT-4o-mini to analyze the job description and extract a rich
+        JSON object of facts for later validation.
+        """
+        messages = self._build_messages(job_details)
+        if messages is None:
+            return None
+
+        cached = self.fit_cache.get(self._cache_key(job_details))
+        if cached is not None:
+            return cached
+
+        try:
+            response = self.openai_client.chat.completions.create(
+                model=FACTS_MODEL,
+                messages=messages,
+                response_format=FACTS_RESPONSE_FORMAT
+            )
+            return self._cache_facts(job_details, self._parse_facts(response.choices[0].message.content))
         except Exception as e:
             logging.error(f"Error calling OpenAI API: {e}")
             return None
-    
-    def validate_job(self, job_detail, validation_data:dict={
-        'experience_years': 3,
-        'is_remote': True,
-        'max_salary': 100000,
-        'work_model': 'remote',
-        'max_applicants_count': 300
-    }):
+
+    def _request_semaphore(self) -> asyncio.Semaphore:
+        """The MAX_CONCURRENT_REQUESTS semaphore for the running event loop (each asyncio.run gets its own)."""
+        loop = asyncio.get_running_loop()
+        if self._request_slots_loop is not loop:
+            self._request_slots = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+            self._request_slots_loop = loop
+        return self._request_slots
+
+    async def _request_facts_async(self, client, messages: List[dict], label: str, completion_tokens: int,
+                                   response_format: dict = FACTS_RESPONSE_FORMAT) -> Optional[dict]:
+        """Sends one facts request once rate-limit capacity is available, retrying on 429s."""
+        token_estimate = self._count_tokens(messages) + completion_tokens
+        slots = self._request_semaphore()
+        for attempt in range(MAX_ATTEMPTS):
+            await self.request_bucket.acquire(1)
+            await self.token_bucket.acquire(token_estimate)
+            try:
+                async with slots:
+                    response = await client.chat.completions.create(
+                        model=FACTS_MODEL,
+                        messages=messages,
+                        response_format=response_format
+                    )
+                return self._parse_facts(response.choices[0].message.content)
+            except openai.RateLimitError as e:
+                # Our limits were too optimistic: slow both buckets down, then back off with jitter
+                self.request_bucket.penalize()
+                self.token_bucket.penalize()
+                delay = 2 ** attempt + random.random()
+                logger.warning(f"Rate limited on {label} (attempt {attempt + 1}/{MAX_ATTEMPTS}), retrying in {delay:.1f}s: {e}")
+                await asyncio.sleep(delay)
+            except Exception as e:
+                logging.error(f"Error calling OpenAI API: {e}")
+                return None
+
+        logger.error(f"Giving up on {label} after {MAX_ATTEMPTS} rate-limited attempts.")
+        return None
+
+    async def _fetch_job_facts_async(self, client, job_details: dict) -> Optional[dict]:
+        messages = self._build_messages(job_details)
+        if messages is None:
+            return None
+        job_data = await self._request_facts_async(
+            client, messages, f"job {job_details.get('job_id')}", EXPECTED_COMPLETION_TOKENS
+        )
+        return self._cache_facts(job_details, job_data)
+
+    async def _get_job_facts_async(self, client, job_details: dict) -> Optional[dict]:
+        """Async variant of get_job_facts that waits for rate-limit capacity and retries on 429s."""
+        if job_details.get("description"):
+            cached = self.fit_cache.get(self._cache_key(job_details))
+            if cached is not None:
+                return cached
+        return await self._fetch_job_facts_async(client, job_details)
+
+    async def _get_job_facts_group_async(self, client, job_details_list: List[dict]) -> List[Optional[dict]]:
+        """
+        Extracts facts for up to JOBS_PER_REQUEST jobs with a single chat request.
+        Falls back to one request per job if the model returns the wrong number of results.
+        """
+        results: List[Optional[dict]] = [None] * len(job_details_list)
+        pending = []
+        for index, job in enumerate(job_details_list):
+            if not job.get("description"):
+                logging.warning(f"No description found for job {job.get('job_id')}, skipping AI analysis.")
+                continue
+            cached = self.fit_cache.get(self._cache_key(job))
+            if cached is not None:
+                results[index] = cached
+            else:
+                pending.append(index)
+
+        if len(pending) == 1:
+            results[pending[0]] = await self._fetch_job_facts_async(client, job_details_list[pending[0]])
+        elif pending:
+            pending_jobs = [job_details_list[index] for index in pending]
+            response = await self._request_facts_async(
+                client,
+                self._build_multi_messages(pending_jobs),
+                f"{len(pending_jobs)} jobs",
+                EXPECTED_COMPLETION_TOKENS * len(pending_jobs),
+                response_format=MULTI_FACTS_RESPONSE_FORMAT
+            )
+            group_results = response.get("results") if isinstance(response, dict) else None
+
+            if isinstance(group_results, list) and len(group_results) == len(pending_jobs):
+                for index, job, job_data in zip(pending, pending_jobs, group_results):
+                    results[index] = self._cache_facts(job, job_data if isinstance(job_data, dict) else None)
+            else:
+                logger.warning(f"Expected {len(pending_jobs)} results from grouped request, falling back to one request per job.")
+                fallback = await asyncio.gather(*[self._fetch_job_facts_async(client, job) for job in pending_jobs])
+                for index, job_data in zip(pending, fallback):
+                    results[index] = job_data
+
+        return results
+
+    def async_client(self) -> openai.AsyncOpenAI:
+        """New AsyncOpenAI client; create one per event loop and use it as an async context manager."""
+        return openai.AsyncOpenAI(
+            api_key=os.environ.get("OPENAI_API_KEY", ""),
+            http_client=httpx.AsyncClient(http2=OPENAI_HTTP2, limits=OPENAI_HTTP_LIMITS, timeout=OPENAI_HTTP_TIMEOUT)
+        )
+
+    async def _embed_texts_async(self, client, texts: List[str]) -> List[Optional[np.ndarray]]:
+        """
+        Embeds texts, serving repeats from the embedding cache and sending all
+        misses in as few requests as possible (EMBEDDING_BATCH_SIZE inputs each).
+        """
+        keys = [EmbeddingCache.make_key(EMBEDDING_MODEL, text) for text in texts]
+        vectors = {}
+        misses = {}
+        for key, text in zip(keys, texts):
+            if key in vectors or key in misses:
+                continue
+            cached = self.embedding_cache.get(key)
+            if cached is not None:
+                vectors[key] = cached
+            else:
+                misses[key] = text
+
+        miss_items = list(misses.items())
+        for start in range(0, len(miss_items), EMBEDDING_BATCH_SIZE):
+            chunk = miss_items[start:start + EMBEDDING_BATCH_SIZE]
+            try:
+                response = await client.embeddings.create(
+                    model=EMBEDDING_MODEL, input=[text for _, text in chunk]
+                )
+                # data[i].index refers to the position in this request's input
+                new_vectors = [(chunk[item.index][0], item.embedding) for item in response.data]
+                self.embedding_cache.set_many(new_vectors)
+                vectors.update(new_vectors)
+            except Exception as e:
+                logger.warning(f"Could not embed {len(chunk)} job descriptions: {e}")
+
+        return [np.array(vectors[key]) if key in vectors else None for key in keys]
+
+    async def embed_jobs_async(self, client, job_details_list: List[dict]):
+        """Embeds every job description up front in batched requests, so later lookups are cache hits."""
+        texts = [job["description"][:JD_PROMPT_CHARS] for job in job_details_list if job.get("description")]
+        if self.cv_embedding is not None and texts:
+            await self._embed_texts_async(client, texts)
+            self.embedding_cache.log_stats()
+
+    async def _cv_similarities_async(self, client, job_details_list: List[dict]) -> List[Optional[float]]:
+        """Cosine similarity between the CV and each job description (None if it can't be computed)."""
+        similarities: List[Optional[float]] = [None] * len(job_details_list)
+        if self.cv_embedding is None:
+            return similarities
+
+        indexes = [index for index, job in enumerate(job_details_list) if job.get("description")]
+        vectors = await self._embed_texts_async(
+            client, [job_details_list[index]["description"][:JD_PROMPT_CHARS] for index in indexes]
+        )
+        for index, vector in zip(indexes, vectors):
+            if vector is not None:
+                # OpenAI embeddings are unit length, so the dot product is the cosine
+                similarities[index] = float(np.dot(self.cv_embedding, vector))
+        return similarities
+
+    async def _cv_similarities_with_new_client(self, job_details_list: List[dict]) -> List[Optional[float]]:
+        async with self.async_client() as client:
+            return await self._cv_similarities_async(client, job_details_list)
+
+    def _quick_reject(self, job_description_text: str, validation_data: dict) -> Optional[str]:
+        """Reason to reject the job from keywords alone (experience, geography, clearance, on-site), or None."""
+        years = [int(match) for match in _EXPERIENCE_YEARS_RE.findall(job_description_text)]
+        if years and min(years) > validation_data['experience_years'] + QUICK_REJECT_YEARS_MARGIN:
+            return f"prefilter: requires {min(years)}+ years of experience"
+        for pattern, reason in _HARD_DISQUALIFIERS:
+            match = pattern.search(job_description_text)
+            if match:
+                return f"prefilter: {reason} ('{match.group(0)}')"
+        if validation_data.get('work_model') == 'remote':
+            match = _ONSITE_ONLY_RE.search(job_description_text)
+            if match:
+                return f"prefilter: on-site only ('{match.group(0)}')"
+        return None
+
+    def _quick_reject_validations(self, job_detail: dict, reason: str) -> dict:
+        return {
+            'is_fit': False,
+            'reason': f"Skipped LLM analysis: {reason}.",
+            'applicants_count': str(job_detail.get("applicants_count")),
+            'company_people_locations': job_detail.get('company_people_locations'),
+        }
+
+    def _skip_llm_validations(self, job_detail: dict, similarity: Optional[float], validation_data: dict) -> Optional[dict]:
+        """Validations for a job decided without the LLM (keyword reject or low CV similarity), else None."""
+        reason = self._quick_reject(job_detail.get("description") or "", validation_data)
+        if reason:
+            return self._quick_reject_validations(job_detail, reason)
+        if similarity is not None and similarity < MIN_CV_SIMILARITY:
+            return self._low_similarity_validations(job_detail, similarity)
+        return None
+
+    def _low_similarity_validations(self, job_detail: dict, similarity: float) -> dict:
+        return {
+            'is_fit': False,
+            'confidence_score': round(similarity, 2),
+            'reason': f"Skipped LLM analysis: CV/JD similarity {similarity:.2f} is below {MIN_CV_SIMILARITY}.",
+            'applicants_count': str(job_detail.get("applicants_count")),
+            'company_people_locations': job_detail.get('company_people_locations'),
+        }
+
+    async def _validate_all_async(self, job_details_list: List[dict], validation_data: dict) -> List[dict]:
+        groups = [
+            job_details_list[start:start + JOBS_PER_REQUEST]
+            for start in range(0, len(job_details_list), JOBS_PER_REQUEST)
+        ]
+        async with self.async_client() as client:
+            await self.embed_jobs_async(client, job_details_list)
+            group_results = await asyncio.gather(
+                *[self.validate_jobs_async(client, group, validation_data) for group in groups]
+            )
+        return [validations for group in group_results for validations in group]
+
+    def build_batch_line(self, custom_id: str, job_details: dict) -> Optional[dict]:
+        """Builds one Batch API JSONL record for a job, or None if the job has no description."""
+        messages = self._build_messages(job_details)
+        if messages is None:
+            return None
+        return {
+            "custom_id": custom_id,
+            "method": "POST",
+            "url": "/v1/chat/completions",
+            "body": {
+                "model": FACTS_MODEL,
+                "messages": messages,
+                "response_format": FACTS_RESPONSE_FORMAT
+            }
+        }
+
+    def submit_batch(self, lines: List[dict]) -> str:
+        """Uploads the JSONL requests and creates a batch job. Returns the batch id."""
+        payload = b"\n".join(orjson.dumps(line) for line in lines)
+        batch_file = self.openai_client.files.create(
+            file=("job_facts_batch.jsonl", payload),
+            purpose="batch"
+        )
+        batch = self.openai_client.batches.create(
+            input_file_id=batch_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window=BATCH_COMPLETION_WINDOW
+        )
+        logger.info(f"Submitted batch {batch.id} with {len(lines)} requests.")
+        return batch.id
+
+    def poll_batch(self, batch_id: str):
+        """Blocks until the batch reaches a terminal status, backing off between checks."""
+        delay = BATCH_POLL_INITIAL_DELAY
+        while True:
+            batch = self.openai_client.batches.retrieve(batch_id)
+            if batch.status in BATCH_TERMINAL_STATUSES:
+                logger.info(f"Batch {batch_id} finished with status '{batch.status}'.")
+                return batch
+            logger.info(f"Batch {batch_id} is '{batch.status}', checking again in {delay}s...")
+            time.sleep(delay)
+            delay = min(delay * 2, BATCH_POLL_MAX_DELAY)
+
+    def get_batch_results(self, batch) -> dict:
+        """Downloads the batch output and maps custom_id -> parsed job facts."""
+        if batch.status != "completed" or not batch.output_file_id:
+            logger.error(f"Batch {batch.id} has no output (status: {batch.status}).")
+            return {}
+
+        results = {}
+        content = self.openai_client.files.content(batch.output_file_id).content
+        for line in content.splitlines():
+            if not line.strip():
+                continue
+            record = orjson.loads(line)
+            response = record.get("response") or {}
+            if response.get("status_code") != 200:
+                logger.error(f"Batch request {record.get('custom_id')} failed: {record.get('error')}")
+                continue
+            message_content = response["body"]["choices"][0]["message"]["content"]
+            results[record["custom_id"]] = self._parse_facts(message_content)
+        return results
+
+    def validate_jobs_batch(self, job_details_list: List[dict], validation_data: dict = DEFAULT_VALIDATION_DATA) -> List[dict]:
+        """
+        Same as validate_jobs, but goes through the OpenAI Batch API: half the cost and a
+        separate rate-limit pool, at the price of waiting (up to 24h) for the results.
+        """
+        similarities = asyncio.run(self._cv_similarities_with_new_client(job_details_list))
+
+        skipped = [
+            self._skip_llm_validations(job_detail, similarity, validation_data)
+            for job_detail, similarity in zip(job_details_list, similarities)
+        ]
+
+        lines = []
+        facts_by_id = {}
+        for index, job_detail in enumerate(job_details_list):
+            if skipped[index] is not None:
+                continue
+            cached = self.fit_cache.get(self._cache_key(job_detail))
+            if cached is not None:
+                facts_by_id[str(index)] = cached
+                continue
+            line = self.build_batch_line(str(index), job_detail)
+            if line:
+                lines.append(line)
+        self.fit_cache.log_stats()
+
+        if lines:
+            batch_id = self.submit_batch(lines)
+            batch_facts = self.get_batch_results(self.poll_batch(batch_id))
+            for custom_id, job_data in batch_facts.items():
+                self._cache_facts(job_details_list[int(custom_id)], job_data)
+            facts_by_id.update(batch_facts)
+
+        return [
+            skipped[index] if skipped[index] is not None
+            else self._validate_with_facts(job_detail, facts_by_id.get(str(index)), validation_data)
+            for index, job_detail in enumerate(job_details_list)
+        ]
+
+    def _build_validations(self, job_detail: dict, job_data: dict, validation_data: dict) -> dict:
         # 1. validate years of experience required
         validations = {}
+        validations['is_fit'] = job_data['is_fit']
+        validations['confidence_score'] = job_data['confidence_score']
+        validations['reason'] = job_data['reason']
+        validations['is_experience_year_less_3'] =  isinstance(job_data["experience_min"], int) and job_data["experience_min"] <= validation_data["experience_years"]
+        validations['job_min_experience_years'] = job_data["experience_min"]
+                
+        # 2. validate the work mode
+        validations['is_work_mode_valid'] = job_data['work_model'] == validation_data['work_model'] or job_data['relocation_offered']
+        validations['job_work_model'] = job_data['work_model']
+        validations['relocation_offered'] = job_data['relocation_offered'] or job_data['visa_sponsorship']
         
-        try:
-            job_data = self.get_job_facts(job_detail)
-            if not job_data:
-                logger.error("Failed to get job facts using llm")
-                return validations
-            
-            validations['is_fit'] = job_data['is_fit']
-            validations['confidence_score'] = job_data['confidence_score']
-            validations['reason'] = job_data['reason']
-            validations['is_experience_year_less_3'] =  isinstance(job_data["experience_min"], int) and job_data["experience_min"] <= validation_data["experience_years"]
-            validations['job_min_experience_years'] = job_data["experience_min"]
-                    
-            # 2. validate the work mode
-            validations['is_work_mode_valid'] = job_data['work_model'] == validation_data['work_model'] or job_data['relocation_offered']
-            validations['job_work_model'] = job_data['work_model']
-            validations['relocation_offered'] = job_data['relocation_offered'] or job_data['visa_sponsorship']
-            
-            # 3. validate the job salary range
-            validations['is_salary_valid'] =  isinstance(job_data['salary_max'], int) and job_data['salary_max'] <= validation_data['max_salary']
-            validations['job_max_salary'] = job_data['salary_max']
-        
-            # 4. validate the geographic restrictions
-            validations['is_geo_valid'] = job_data["is_geography_valid"]
-            validations['geographic_restrictions'] = str(job_data["geographic_restrictions"])
-            
-            # 5. validate the number of people applied
-            validations['is_not_saturated'] = isinstance(job_detail['applicants_count'], int) and job_detail['applicants_count'] <= validation_data['max_applicants_count']
-            validations['applicants_count'] = str(job_detail["applicants_count"])
-            
-            # 6. do have Africa working people in the company
-            validations['does_hired_from_africa'] = isinstance(job_data['does_hired_from_africa'], bool) and job_data['does_hired_from_africa'] == True
-            validations['does_hired_from_ethiopia'] = isinstance(job_data['does_hired_from_ethiopia'], bool) and job_data['does_hired_from_ethiopia'] == True
-            validations['company_people_locations'] = job_detail['company_people_locations']
+        # 3. validate the job salary range
+        validations['is_salary_valid'] =  isinstance(job_data['salary_max'], int) and job_data['salary_max'] <= validation_data['max_salary']
+        validations['job_max_salary'] = job_data['salary_max']
     
-            # 7. validate the skill set matches
-            validations['skill_matching_perc'] = job_data['skill_matching_percentage']
-            validations['required_skills']=", ".join(job_data["required_skills"] + ['nice_to_have_skills: ']  + job_data['required_skills'])
-            validations['missing_skills']= ", ".join(job_data['missing_skills'])
-            
-            # 8. Validate the company legit and job post legit
-            validations['is_company_legit'] = job_data['is_company_legit']
-            validations['is_job_post_legit'] = job_data['is_job_post_legit']
-            validations['red_flags'] = ", ".join(job_data['red_flags'])        
-            return validations
+        # 4. validate the geographic restrictions
+        validations['is_geo_valid'] = job_data["is_geography_valid"]
+        validations['geographic_restrictions'] = str(job_data["geographic_restrictions"])
+        
+        # 5. validate the number of people applied
+        validations['is_not_saturated'] = isinstance(job_detail['applicants_count'], int) and job_detail['applicants_count'] <= validation_data['max_applicants_count']
+        validations['applicants_count'] = str(job_detail["applicants_count"])
         
+        # 6. do have Africa working people in the company
+        validations['does_hired_from_africa'] = isinstance(job_data['does_hired_from_africa'], bool) and job_data['does_hired_from_africa'] == True
+        validations['does_hired_from_ethiopia'] = isinstance(job_data['does_hired_from_ethiopia'], bool) and job_data['does_hired_from_ethiopia'] == True
+        validations['company_people_locations'] = job_detail['company_people_locations']
+
+        # 7. validate the skill set matches
+        validations['skill_matching_perc'] = job_data['skill_matching_percentage']
+        validations['required_skills']=", ".join(job_data["required_skills"] + ['nice_to_have_skills: ']  + job_data['required_skills'])
+        validations['missing_skills']= ", ".join(job_data['missing_skills'])
+        
+        # 8. Validate the company legit and job post legit
+        validations['is_company_legit'] = job_data['is_company_legit']
+        validations['is_job_post_legit'] = job_data['is_job_post_legit']
+        validations['red_flags'] = ", ".join(job_data['red_flags'])        
+        return validations
+
+    def _validate_with_facts(self, job_detail: dict, job_data: Optional[dict], validation_data: dict) -> dict:
+        if not job_data:
+            logger.error("Failed to get job facts using llm")
+            return {}
+        try:
+            return self._build_validations(job_detail, job_data, validation_data)
         except Exception as e:
             logging.error(f"Error doing validation: {e}")
-            return validations
+            return {}
+
+    def validate_job(self, job_detail, validation_data:dict=DEFAULT_VALIDATION_DATA):
+        reason = self._quick_reject(job_detail.get("description") or "", validation_data)
+        if reason:
+            return self._quick_reject_validations(job_detail, reason)
+        job_data = self.get_job_facts(job_detail)
+        return self._validate_with_facts(job_detail, job_data, validation_data)
+
+    async def validate_jobs_async(self, client, job_details_list: List[dict], validation_data: dict = DEFAULT_VALIDATION_DATA) -> List[dict]:
+        """
+        Async validation of a small group of jobs (up to JOBS_PER_REQUEST) in one LLM
+        request, sharing the validator's rate limiter across concurrent callers.
+        Jobs rejected by the keyword pre-filter, or clearly unrelated to the CV
+        (embedding similarity), skip the LLM.
+        """
+        similarities = await self._cv_similarities_async(client, job_details_list)
+        skipped = [
+            self._skip_llm_validations(job_detail, similarity, validation_data)
+            for job_detail, similarity in zip(job_details_list, similarities)
+        ]
+        to_analyse = [job for job, validations in zip(job_details_list, skipped) if validations is None]
+        if len(to_analyse) < len(job_details_list):
+            logger.info(f"Pre-filters skipped {len(job_details_list) - len(to_analyse)} of {len(job_details_list)} jobs.")
+
+        facts = iter(await self._get_job_facts_group_async(client, to_analyse))
+        return [
+            validations if validations is not None
+            else self._validate_with_facts(job_detail, next(facts), validation_data)
+            for job_detail, validations in zip(job_details_list, skipped)
+        ]
+
+    def validate_jobs(self, job_details_list: List[dict], validation_data: dict = DEFAULT_VALIDATION_DATA) -> List[dict]:
+        """
+        Validates many jobs at once. The OpenAI calls run concurrently, throttled to
+        the model's RPM/TPM budget, instead of one blocking call per job.
+
+        Returns:
+            List[dict]: One validations dict per job (empty on failure), in input order.
+        """
+        logger.info(f"Extracting job facts for {len(job_details_list)} jobs in parallel...")
+        all_validations = asyncio.run(self._validate_all_async(job_details_list, validation_data))
+        self.fit_cache.log_stats()
+        return all_validations
     
 if __name__ == "__main__":
     job_validator = JobValidator()
@@ -1,8 +1,16 @@
+import atexit
+import functools
+import hashlib
+import importlib.util
+import multiprocessing.util
 import os
+import threading
 import time
-import json
+import asyncio
 import logging
+import httpx
 import gspread
+import orjson
 import openai
 from selenium import webdriver
 from selenium.webdriver.common.by import By
@@ -15,13 +23,27 @@ from selenium.common.exceptions import NoSuchElementException, StaleElementRefer
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from bs4 import BeautifulSoup
-from typing import Any, Dict, Optional, List
+from lxml import etree, html as lxml_html
+try:
+    # Optional: much faster HTML parsing and CSS selection than BeautifulSoup
+    from selectolax.parser import HTMLParser
+except ImportError:
+    HTMLParser = None
+from typing import Any, Dict, Optional, List, Tuple
 import re
 from datetime import datetime, timedelta
 from urllib.parse import unquote
 from job_agent.linkedin.model import Country, JobType, ScraperInput, Site, JobResponse
 
+from job_agent.linkedin.exceptions import (
+    CaptchaRequiredError,
+    DriverInitializationError,
+    InvalidCredentialsError,
+    LoginTimeoutError,
+    SecurityChallengeError,
+)
 from job_agent.linkedin.job_search import JobSearch
+from job_agent.linkedin.job_validator import OPENAI_HTTP2, OPENAI_HTTP_LIMITS, OPENAI_HTTP_TIMEOUT
 logger = logging.getLogger(__name__)
 
 # --- Configuration ---
@@ -48,9 +70,16 @@ Looking for remote-first roles in AI/ML Engineering or Senior Data Science.
 """
 
 # 5. The site configuration.
+#    "renderer" picks how job pages are fetched: "http" downloads the server-rendered
+#    HTML (falling back to the browser per page when it's not usable), "browser"
+#    always loads them in the WebDriver (for JS-only sites). "search_renderer" does
+#    the same for the results listing: "http" reads the guest search endpoint and
+#    only starts a browser when that returns nothing.
 JOB_SITES_CONFIG = [
     {
         "name": "LinkedIn",
+        "renderer": "http",
+        "search_renderer": "http",
         "search_url": "https://www.linkedin.com/jobs/search/?keywords=machine%20learning%20engineer&location=United%20States&f_WT=2&geoId=103644278&f_TPR=r86400",
         "job_card_selector": "div.base-search-card",
         "job_link_selector_within_card": "a.base-card__full-link",
@@ -62,6 +91,91 @@ JOB_SITES_CONFIG = [
 # 6. Cookie file for LinkedIn (must be in the same folder)
 LINKEDIN_COOKIE_FILE = "cookies.json"
 
+# 7. Job detail pages and how many of them to download at once.
+LINKEDIN_JOB_VIEW_URL = "https://www.linkedin.com/jobs/view/{job_id}/"
+DETAIL_FETCH_CONCURRENCY = 5
+# Keep-alive pool for the HTTP fetches; HTTP/2 (every request multiplexed over one TLS
+# connection) when the optional 'h2' package is installed.
+DETAIL_FETCH_HTTP2 = importlib.util.find_spec("h2") is not None
+DETAIL_FETCH_LIMITS = httpx.Limits(max_keepalive_connections=20, max_connections=20, keepalive_expiry=30)
+
+# 8. Explicit-wait settings for browser page loads.
+PAGE_READY_TIMEOUT = 15
+# Minimum gap between two page loads in the same browser (only the unspent part is slept)
+POLITENESS_DELAY = 0.3
+COMPANY_LOCATIONS_SELECTOR = "div.org-people-bar-graph-module__geo-region"
+# https://www.linkedin.com/company/<name> prefix of any company page URL
+_COMPANY_BASE_URL_RE = re.compile(r'^(https?://(?:www\.)?linkedin\.com/company/[^/]+)')
+# Wait conditions built once; they hold no per-page state
+COMPANY_LOCATIONS_PRESENT = EC.presence_of_element_located((By.CSS_SELECTOR, COMPANY_LOCATIONS_SELECTOR))
+# The description box exists *and* its text has been rendered into it
+_JOB_DESCRIPTION_FILLED_JS = (
+    "const el = document.querySelector(\"[data-testid='expandable-text-box']\");"
+    "return !!el && el.innerText.trim().length > 0;"
+)
+# Job page queries, compiled once and run relative to <main> (first match is used unless noted)
+_JOB_H1_XPATH = etree.XPath(".//h1")
+_JOB_PAGE_TITLE_XPATH = etree.XPath("//title")
+_COMPANY_LINK_XPATH = etree.XPath(".//a[contains(@href, '/company/')]")
+_JOB_DESCRIPTION_XPATH = etree.XPath(".//*[@data-testid='expandable-text-box']")
+_JOB_DETAILS_XPATH = etree.XPath(".//*[@id='job-details']")
+_MAIN_XPATH = etree.XPath("//main")
+_TOP_CARD_XPATH = etree.XPath(".//div[contains(@class, 'top-card')]")
+_PARAGRAPH_XPATH = etree.XPath(".//p")
+_APPLY_BUTTON_XPATH = etree.XPath(".//*[@data-view-name='job-apply-button']")
+# Top-card metadata parts: which kind a part is ("3 days ago", "45 applicants") and its number
+_POSTED_HINT_RE = re.compile(r'ago|minute|hour|day|week|month')
+_APPLICANTS_HINT_RE = re.compile(r'applicant|people|apply')
+_DIGITS_RE = re.compile(r'\d+')
+# Text nodes under an element in document order; script/style text is skipped, as BeautifulSoup's get_text does
+_TEXT_NODES_XPATH = etree.XPath(".//text()[not(ancestor::script) and not(ancestor::style)]")
+
+
+def _element_text(element, separator: str = "", strip: bool = False) -> str:
+    """BeautifulSoup-style get_text for an lxml element."""
+    texts = _TEXT_NODES_XPATH(element)
+    if strip:
+        texts = [text.strip() for text in texts]
+        texts = [text for text in texts if text]
+    return separator.join(texts)
+
+
+def job_description_filled(driver) -> bool:
+    """WebDriverWait condition: the job description has text, so the page is ready to read."""
+    return driver.execute_script(_JOB_DESCRIPTION_FILLED_JS)
+
+
+# [location, count text] for every bar in the chart matched by arguments[0], read in one
+# round-trip; null when the chart is missing.
+_COMPANY_LOCATIONS_JS = """
+const container = document.querySelector(arguments[0]);
+if (!container) return null;
+const entries = [];
+container.querySelectorAll('button.org-people-bar-graph-element').forEach((entry) => {
+  const count = entry.querySelector('strong');
+  const location = entry.querySelector('span.org-people-bar-graph-element__category');
+  if (count && location) entries.push([location.textContent.trim(), count.textContent.trim()]);
+});
+return entries;
+"""
+
+# 9. Subresources we never parse; Chrome is told not to download them.
+BLOCKED_URL_PATTERNS = [
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.avif", "*.svg", "*.ico",
+    "*.woff", "*.woff2", "*.ttf", "*.otf",
+    "*.mp4", "*.webm", "*.mp3",
+    "*google-analytics*", "*googletagmanager*", "*doubleclick*",
+    # LinkedIn's own tracking and ad beacons
+    "*/li/track*", "*px.ads.linkedin.com*", "*/sensorCollect*",
+]
+
+# 10. Logged-in browsers are kept warm between agents for this long (seconds) after release.
+DRIVER_IDLE_TIMEOUT = 600
+# A cookie that passed the login probe is trusted this long (seconds) before being probed again.
+LOGIN_PROBE_TTL = 1800
+# Upper bound (seconds) on waiting for the post-login redirect to settle.
+LOGIN_REDIRECT_TIMEOUT = 3
+
 # --- Logging Setup ---
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 import platform
@@ -79,6 +193,22 @@ def get_default_user_agent() -> str:
         return "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/137.0.0.0 Safari/537.36"
 
 
+def find_jobs_without_browser(scraper_input: ScraperInput, seen_ids: Optional[set] = None) -> JobResponse:
+    """
+    Runs the search through LinkedIn's guest endpoint when the site config allows
+    it. An empty response means the caller should search with a browser instead.
+    """
+    site_config = next(site for site in JOB_SITES_CONFIG if site["name"] == "LinkedIn")
+    if site_config.get("search_renderer", "browser") != "http":
+        return JobResponse(jobs=[])
+    try:
+        job_search = JobSearch(driver=None, close_on_complete=False, scrape=False)
+        return job_search.search_guest(scraper_input, seen_ids=seen_ids, user_agent=get_default_user_agent())
+    except Exception as e:
+        logging.error(f"Guest search error: {e}")
+        return JobResponse(jobs=[])
+
+
 def create_chrome_options() -> Options:
     """
     Create Chrome options with all necessary configuration for LinkedIn scraping.
@@ -108,10 +238,23 @@ def create_chrome_options() -> Options:
     chrome_options.add_argument("--metrics-recording-only")
     chrome_options.add_argument("--no-default-browser-check")
     chrome_options.add_argument("--no-first-run")
-    chrome_options.add_argument("--disable-features=TranslateUI,BlinkGenPropertyTrees")
+    # Chrome only honours the last --disable-features switch, so keep them in one list
+    chrome_options.add_argument(
+        "--disable-features=TranslateUI,BlinkGenPropertyTrees,Translate,MediaRouter,"
+        "BackForwardCache,OptimizationHints"
+    )
     chrome_options.add_argument("--aggressive-cache-discard")
     chrome_options.add_argument("--disable-ipc-flooding-protection")
 
+    # Lower the per-instance memory footprint so more browsers fit in one container
+    chrome_options.add_argument("--mute-audio")
+    chrome_options.add_argument("--memory-pressure-off")
+    # Images that slip past the URL block list (data: URIs, CDNs without extensions) are never decoded
+    chrome_options.add_argument("--blink-settings=imagesEnabled=false")
+
+    # Return from driver.get() on DOMContentLoaded; callers wait for the elements they need
+    chrome_options.page_load_strategy = "eager"
+
     # Set user agent (configurable with platform-specific default)
     user_agent = get_default_user_agent()
     chrome_options.add_argument(f"--user-agent={user_agent}")
@@ -125,7 +268,10 @@ def find_chromedriver() -> Optional[str]:
     if path := os.getenv("CHROMEDRIVER"):
         if os.path.exists(path):
             return path
-        
+    # Otherwise Selenium Manager resolves the driver matching the installed Chrome (and caches it)
+    return None
+
+
 def create_chrome_service():
     # Use ChromeDriver path from environment or config
     chromedriver_path = (
@@ -157,15 +303,36 @@ def create_chrome_driver() -> webdriver.Chrome:
 
     logger.info("Chrome WebDriver initialized successfully")
 
+    # Block images, media, fonts and trackers before the first navigation
+    try:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": BLOCKED_URL_PATTERNS})
+    except Exception as e:
+        logger.warning(f"Could not enable subresource blocking: {e}")
+
     # Add a page load timeout for safety
     driver.set_page_load_timeout(60)
 
-    # Set shorter implicit wait for faster cookie validation
-    driver.implicitly_wait(10)
+    # No implicit wait: every wait is an explicit WebDriverWait, and an implicit one would make
+    # each lookup that legitimately finds nothing (and every wait condition poll) block for its full length
+    driver.implicitly_wait(0)
 
     return driver
 
 
+# URL fragments of pages only a logged-in session lands on
+_AUTHENTICATED_URL_INDICATORS = ("feed", "mynetwork", "linkedin.com/in/", "/feed/")
+
+
+def _classify_login_url(url: str) -> Optional[bool]:
+    """True on an authenticated page, False on a login page, None while still elsewhere."""
+    if "login" in url:
+        return False
+    if any(indicator in url for indicator in _AUTHENTICATED_URL_INDICATORS):
+        return True
+    return None
+
+
 def login_with_cookie(driver: webdriver.Chrome, cookie: str) -> bool:
     import time
 
@@ -200,8 +367,7 @@ def login_with_cookie(driver: webdriver.Chrome, cookie: str) -> bool:
                     logger.info(
                         "LinkedIn-scraper reported InvalidCredentialsError - verifying actual authentication status..."
                     )
-                    # Give LinkedIn time to complete redirect
-                    time.sleep(2)
+                    # The URL check below waits for the redirect to complete
                     break
                 else:
                     logger.warning(f"Login attempt failed: {e}")
@@ -215,47 +381,30 @@ def login_with_cookie(driver: webdriver.Chrome, cookie: str) -> bool:
                     else:
                         return False
 
-        # Check authentication status by examining the current URL
+        # Check authentication status by examining the current URL, polling briefly
+        # until the post-login redirect lands on a login or an authenticated page
         try:
-            current_url = driver.current_url
+            try:
+                WebDriverWait(driver, LOGIN_REDIRECT_TIMEOUT).until(
+                    lambda d: _classify_login_url(d.current_url) is not None
+                )
+            except TimeoutException:
+                pass
 
-            # Check if we're on login page (authentication failed)
-            if "login" in current_url or "uas/login" in current_url:
+            final_url = driver.current_url
+            authenticated = _classify_login_url(final_url)
+            if authenticated is None:
                 logger.warning(
-                    "Cookie authentication failed - redirected to login page"
+                    f"Cookie authentication uncertain - unexpected final page: {final_url}"
                 )
                 return False
-
-            # Check if we're on authenticated pages (authentication succeeded)
-            elif any(
-                indicator in current_url
-                for indicator in ["feed", "mynetwork", "linkedin.com/in/", "/feed/"]
-            ):
-                logger.info("Cookie authentication successful")
-                return True
-
-            # Unexpected page - wait briefly and check again
-            else:
-                logger.info(
-                    "Unexpected page after login, checking authentication status..."
+            if not authenticated:
+                logger.warning(
+                    "Cookie authentication failed - redirected to login page"
                 )
-                time.sleep(2)
-
-                final_url = driver.current_url
-                if "login" in final_url or "uas/login" in final_url:
-                    logger.warning("Cookie authentication failed - ended on login page")
-                    return False
-                elif any(
-                    indicator in final_url
-                    for indicator in ["feed", "mynetwork", "linkedin.com/in/", "/feed/"]
-                ):
-                    logger.info("Cookie authentication successful after verification")
-                    return True
-                else:
-                    logger.warning(
-                        f"Cookie authentication uncertain - unexpected final page: {final_url}"
-                    )
-                    return False
+                return False
+            logger.info("Cookie authentication successful")
+            return True
 
         except Exception as e:
             logger.error(f"Error checking authentication status: {e}")
@@ -268,9 +417,38 @@ def login_with_cookie(driver: webdriver.Chrome, cookie: str) -> bool:
         # Restore normal timeout
         driver.set_page_load_timeout(60)
         
+def _authentication_key(authentication: str) -> str:
+    return hashlib.sha256(authentication.encode("utf-8")).hexdigest()
+
+
+# When each cookie (by hash) last passed the full login probe in this process
+_LOGIN_VERIFIED: Dict[str, float] = {}
+
+
+def _install_session_cookie(driver: webdriver.Chrome, cookie: str) -> bool:
+    """Sets the li_at cookie through CDP, without loading any page."""
+    try:
+        driver.execute_cdp_cmd("Network.setCookie", {
+            "name": "li_at", "value": cookie, "url": "https://www.linkedin.com/", "secure": True,
+        })
+        return True
+    except Exception as e:
+        logger.warning(f"Could not set session cookie directly: {e}")
+        return False
+
+
 def login_to_linkedin(driver: webdriver.Chrome, authentication: str) -> None:
+    # A cookie that passed the probe recently is still valid; skip the login page and feed render
+    key = _authentication_key(authentication)
+    verified_at = _LOGIN_VERIFIED.get(key)
+    if verified_at is not None and time.time() - verified_at < LOGIN_PROBE_TTL:
+        if _install_session_cookie(driver, authentication):
+            logger.info("Cookie verified recently; skipped the login probe")
+            return
+
     # Try cookie authentication
     if login_with_cookie(driver, authentication):
+        _LOGIN_VERIFIED[key] = time.time()
         logger.info("Successfully logged in to LinkedIn using cookie")
         return
 
@@ -296,14 +474,68 @@ def login_to_linkedin(driver: webdriver.Chrome, authentication: str) -> None:
     except Exception as e:
         raise LoginTimeoutError(f"Login failed: {str(e)}")
     
+# Idle, logged-in drivers by hash of the cookie they logged in with, and when they were released.
+# A driver is taken out while an agent uses it, so two agents never share one.
+_DRIVER_POOL: Dict[str, Tuple[webdriver.Chrome, float]] = {}
+_POOL_LOCK = threading.Lock()
+
+
+def _quit_driver(driver: webdriver.Chrome):
+    try:
+        driver.quit()
+    except Exception as e:
+        logger.warning(f"Failed to quit driver: {e}")
+
+
+def release_driver(authentication: str, driver: webdriver.Chrome):
+    """Hands a logged-in driver back to the pool for the next agent with the same cookie."""
+    key = _authentication_key(authentication)
+    with _POOL_LOCK:
+        previous = _DRIVER_POOL.get(key)
+        _DRIVER_POOL[key] = (driver, time.time())
+    # One idle driver per cookie is enough
+    if previous is not None:
+        _quit_driver(previous[0])
+
+
+def close_pooled_drivers():
+    """Quits every idle pooled driver."""
+    with _POOL_LOCK:
+        drivers = [driver for driver, _ in _DRIVER_POOL.values()]
+        _DRIVER_POOL.clear()
+    for driver in drivers:
+        _quit_driver(driver)
+
+
+atexit.register(close_pooled_drivers)
+# Worker processes (e.g. ProcessPoolExecutor) skip atexit but run multiprocessing finalizers
+multiprocessing.util.Finalize(None, close_pooled_drivers, exitpriority=10)
+
+
 def get_or_create_driver(authentication: str) -> webdriver.Chrome:
-    session_id = "default"  # We use a single session for simplicity
+    """
+    Returns a logged-in driver, from the pool when one is warm.
 
-    # Return existing driver if available
-    # if session_id in active_drivers:
-    #     logger.info("Using existing Chrome WebDriver session")
-    #     return active_drivers[session_id]
+    Raises:
+        DriverInitializationError: If Chrome could not be started or logged in
+    """
+    key = _authentication_key(authentication)
+    with _POOL_LOCK:
+        pooled = _DRIVER_POOL.pop(key, None)
+
+    # Reuse a warm, logged-in driver unless it sat idle too long or its browser died
+    if pooled is not None:
+        driver, released_at = pooled
+        if time.time() - released_at < DRIVER_IDLE_TIMEOUT:
+            try:
+                driver.current_url
+                logger.info("Using existing Chrome WebDriver session")
+                return driver
+            except Exception as e:
+                logger.info(f"Pooled Chrome WebDriver session is gone, creating a new one: {e}")
+        _quit_driver(driver)
 
+    driver = None
     try:
         driver = create_chrome_driver()
         login_to_linkedin(driver, authentication)
@@ -311,42 +543,67 @@ def get_or_create_driver(authentication: str) -> webdriver.Chrome:
         return driver
     except Exception as e:
         logger.error(f"error creating driver: {e}")
-        pass
+        # A browser that started but could not log in would otherwise outlive the run
+        if driver is not None:
+            _quit_driver(driver)
+        raise DriverInitializationError(f"Error creating web driver: {e}") from e
     
 
+# "<n> <unit> ago" on job pages; units are matched with any plural 's' removed.
+_RELATIVE_DATE_RE = re.compile(r'(\d+)\s+(\w+)')
+_RELATIVE_UNIT_SECONDS = {
+    "minute": 60,
+    "hour": 3600,
+    "day": 86400,
+    "week": 7 * 86400,
+    "month": 30 * 86400,  # Approx
+    "year": 365 * 86400,
+}
+
+
 def parse_relative_date(date_str):
     if "just now" in date_str.lower():
         return datetime.now()
 
-    # Regex to find the number and the unit (e.g., "1", "week")
-    match = re.search(r'(\d+)\s+(\w+)', date_str)
+    # Find the number and the unit (e.g., "1", "week")
+    match = _RELATIVE_DATE_RE.search(date_str)
     
     if match:
         qty = int(match.group(1))
-        unit = match.group(2).lower() # e.g., "week", "days", "hours"
-        
-        if 'minute' in unit:
-            delta = timedelta(minutes=qty)
-        elif 'hour' in unit:
-            delta = timedelta(hours=qty)
-        elif 'day' in unit:
-            delta = timedelta(days=qty)
-        elif 'week' in unit:
-            delta = timedelta(weeks=qty)
-        elif 'month' in unit:
-            delta = timedelta(days=qty * 30) # Approx
-        elif 'year' in unit:
-            delta = timedelta(days=qty * 365)
-        else:
-            delta = timedelta(seconds=0)
-            
-        return datetime.now() - delta
+        unit = match.group(2).lower().rstrip("s") # e.g., "week", "day", "hour"
+        return datetime.now() - timedelta(seconds=qty * _RELATIVE_UNIT_SECONDS.get(unit, 0))
     
     return None # Fallback if format is unexpected
 
 
 
         
+# Cookie-export sameSite values Chrome accepts
+_VALID_SAME_SITE = {"Strict", "Lax", "None"}
+
+
+@functools.cache
+def _load_cookie_file(path: str) -> tuple:
+    """
+    Reads a browser cookie export once per process and converts it to CDP
+    Network.setCookies parameters. Returns a tuple so the cached value can't be mutated.
+    """
+    with open(path, "rb") as f:
+        exported = orjson.loads(f.read())
+
+    cookies = []
+    for cookie in exported:
+        param = {key: cookie[key] for key in ("name", "value", "domain", "path", "secure", "httpOnly") if key in cookie}
+        if "expirationDate" in cookie:
+            param["expires"] = int(cookie["expirationDate"])
+        if cookie.get("sameSite") in _VALID_SAME_SITE:
+            param["sameSite"] = cookie["sameSite"]
+        elif "sameSite" in cookie:
+            logging.warning(f"Removing invalid 'sameSite' value: {cookie['sameSite']}")
+        cookies.append(param)
+    return tuple(cookies)
+
+
 class JobScraperAgent:
     """
     An AI agent that scrapes job sites, analyzes job descriptions against a CV,
@@ -354,18 +611,49 @@ class JobScraperAgent:
     """
     def __init__(self, cv_summary=MY_CV_SUMMARY, sheet_name=GOOGLE_SHEET_NAME):
         self.cv_summary = cv_summary
-        self.openai_client = openai.OpenAI(api_key=OPENAI_API_KEY)
-        self.driver = get_or_create_driver(os.environ.get("LINKEDIN_COOKIE", ""))
-        self.wait = WebDriverWait(self.driver, 10)
+        # Shared by the applicators running in parallel threads; same keep-alive pool as the validator
+        self.openai_client = openai.OpenAI(
+            api_key=OPENAI_API_KEY,
+            http_client=httpx.Client(http2=OPENAI_HTTP2, limits=OPENAI_HTTP_LIMITS, timeout=OPENAI_HTTP_TIMEOUT)
+        )
+        self._authentication = os.environ.get("LINKEDIN_COOKIE", "")
+        # The browser is only started once something needs it (see the `driver` property)
+        self._driver = None
+        # Set when starting the browser failed, so later uses fail fast instead of retrying
+        self._driver_error: Optional[DriverInitializationError] = None
+        self._http_client = None
+        # time.monotonic() of the last driver.get(), for _pace_page_load
+        self._last_page_load = 0.0
+        self.site_config = next(site for site in JOB_SITES_CONFIG if site["name"] == "LinkedIn")
+
+
+    @property
+    def driver(self) -> webdriver.Chrome:
+        """
+        The logged-in WebDriver, taken from the pool on first use. Runs whose job
+        pages all parse over HTTP never start a browser. Starting it is tried once;
+        if that fails, every access raises the same DriverInitializationError.
+        """
+        if self._driver is None:
+            if self._driver_error is not None:
+                raise self._driver_error
+            try:
+                self._driver = get_or_create_driver(self._authentication)
+            except DriverInitializationError as e:
+                self._driver_error = e
+                raise
+            self.wait = WebDriverWait(self._driver, 10)
+            self.page_wait = WebDriverWait(self._driver, PAGE_READY_TIMEOUT)
+        return self._driver
+
+    @driver.setter
+    def driver(self, driver: Optional[webdriver.Chrome]):
+        self._driver = driver
 
-    
     def scrape_company_location_stats(self, company_url: str) -> Dict[str, int]:
         logging.info(f"Starting location stats scrape for: {company_url}")
         
-        base_url_match = re.search(
-            r'^(https?://(?:www\.)?linkedin\.com/company/[^/]+)', 
-            company_url
-        )
+        base_url_match = _COMPANY_BASE_URL_RE.search(company_url)
 
         if not base_url_match:
             logging.error(f"Invalid company URL format: {company_url}. Expected '.../company/company-name/'.")
@@ -383,37 +671,24 @@ class JobScraperAgent:
         locations_data: Dict[str, int] = {}
 
         try:
-            # 2. Navigate to the 'people' page
+            # 2. Navigate to the 'people' page and wait until the location chart is rendered
+            self._pace_page_load()
             self.driver.get(people_url)
+            try:
+                self.page_wait.until(COMPANY_LOCATIONS_PRESENT)
+            except TimeoutException:
+                logging.error(f"Timeout waiting for element '{COMPANY_LOCATIONS_SELECTOR}' on {people_url}")
+                return locations_data
             logging.info(f"Navigated to: {people_url}")
-            time.sleep(10)
-            
-            # insight-container
-            html_source = self.driver.page_source
-            soup = BeautifulSoup(html_source, 'html.parser')
-            time.sleep(3)
-            location_container = soup.find('div', class_='org-people-bar-graph-module__geo-region')
-
-            # 3. Create an empty list to store the results
-
-            # 4. Check if the container was found before trying to search inside it
-            if location_container:
-                # 5. Now, find all the <button> elements *only within that container*
-                location_entries = location_container.find_all(
-                    'button', class_='org-people-bar-graph-element'
-                )
 
-                # 6. Loop through each entry found
-                for entry in location_entries:
-                    count_tag = entry.find('strong')
-                    location_tag = entry.find('span', class_='org-people-bar-graph-element__category')
+            # 3. Read every location bar in the browser in one call, instead of shipping
+            #    the chart's HTML back and parsing it again
+            location_entries = self.driver.execute_script(_COMPANY_LOCATIONS_JS, COMPANY_LOCATIONS_SELECTOR)
 
-                    if count_tag and location_tag:
-                        count = count_tag.text.strip()
-                        location = location_tag.text.strip()
-                        
-                        locations_data[location] = int(count)
-            
+            # 4. Check if the container was found
+            if location_entries is not None:
+                for location, count in location_entries:
+                    locations_data[location] = int(count.replace(",", ""))
             else:
                 logger.error("Error: Could not find the location container.")
 
@@ -433,26 +708,11 @@ class JobScraperAgent:
 
         try:
             logging.info("Loading LinkedIn session cookie...")
-            
-            # --- FIX: Go to www.linkedin.com to match the cookie's domain ---
-            self.driver.get("https://www.linkedin.com")
-            
-            with open(LINKEDIN_COOKIE_FILE, 'r') as f:
-                cookies = json.load(f)
-            
-            for cookie in cookies:
-                if 'expirationDate' in cookie:
-                    cookie['expiry'] = int(cookie['expirationDate'])
-                    del cookie['expirationDate']
-
-                if 'sameSite' in cookie and cookie['sameSite'] not in ['Strict', 'Lax', 'None']:
-                    logging.warning(f"Removing invalid 'sameSite' value: {cookie['sameSite']}")
-                    del cookie['sameSite']
+            cookies = _load_cookie_file(LINKEDIN_COOKIE_FILE)
 
-                try:
-                    self.driver.add_cookie(cookie)
-                except Exception as e:
-                    logging.warning(f"Could not add cookie {cookie.get('name')}: {e}")
+            # All cookies in one CDP call. CDP takes each cookie's own domain, so unlike
+            # add_cookie this needs no page load on www.linkedin.com first.
+            self.driver.execute_cdp_cmd("Network.setCookies", {"cookies": list(cookies)})
 
             logging.info("Cookie loaded successfully. Refreshing page as logged-in user.")
             # Refresh the page to be in a "logged in" state
@@ -492,16 +752,50 @@ class JobScraperAgent:
             logging.error(f"An error occurred during login check: {e}")
             return False
         
-    def _get_page_and_wait(self, url, selector_to_wait_for):
+    def _pace_page_load(self):
+        """
+        Keeps page loads at least POLITENESS_DELAY apart. Sleeps only for whatever
+        part of the gap the previous page (its wait and parsing included) hasn't
+        already used up, so slow pages cost no extra delay at all.
+        """
+        remaining = POLITENESS_DELAY - (time.monotonic() - self._last_page_load)
+        if remaining > 0:
+            time.sleep(remaining)
+        self._last_page_load = time.monotonic()
+
+    def _get_subtree_html(self, selector):
+        """
+        Returns the outer HTML of the first element matching `selector`, selected by
+        Chrome itself, so we don't serialise and re-parse the whole (~1 MB) page.
+        """
+        try:
+            return self.driver.execute_script(
+                "const el = document.querySelector(arguments[0]); return el ? el.outerHTML : null;",
+                selector
+            )
+        except Exception as e:
+            logging.warning(f"Could not read subtree for selector '{selector}': {e}")
+            return None
+
+    def _get_page_and_wait(self, url, selector_to_wait_for, timeout=None, subtree_only=False):
         """
         Fetches a URL and waits for a specific element to be present
-        before returning the page source.
+        before returning the page source (or just that element's HTML if `subtree_only`).
         """
         try:
+            self._pace_page_load()
             self.driver.get(url)
-            self.wait.until(
+            if not timeout:
+                wait = self.wait
+            elif timeout == PAGE_READY_TIMEOUT:
+                wait = self.page_wait
+            else:
+                wait = WebDriverWait(self.driver, timeout)
+            wait.until(
                 EC.presence_of_element_located((By.CSS_SELECTOR, selector_to_wait_for))
             )
+            if subtree_only:
+                return self._get_subtree_html(selector_to_wait_for) or self.driver.page_source
             return self.driver.page_source
         except TimeoutException:
             logging.error(f"Timeout waiting for element '{selector_to_wait_for}' on {url}")
@@ -511,9 +805,27 @@ class JobScraperAgent:
             return None
 
     def _extract_text_content(self, html, selector):
-        """Uses BeautifulSoup to extract clean text from a specific part of the page."""
+        """
+        Extracts clean text from a specific part of the page, with selectolax when
+        it is installed and BeautifulSoup otherwise.
+        Pass html=None to read just the matching subtree from the current driver page.
+        """
         try:
-            soup = BeautifulSoup(html, 'html.parser')
+            if html is None:
+                html = self._get_subtree_html(selector) or self.driver.page_source
+            if HTMLParser is not None:
+                tree = HTMLParser(html)
+                content_block = tree.css_first(selector)
+                if content_block is None:
+                    logging.warning(f"Could not find description block with selector: {selector}")
+                    content_block = tree.body
+                return content_block.text(separator=' ', strip=True) if content_block is not None else ""
+            try:
+                # lxml is a C parser, far faster than html.parser on full LinkedIn pages
+                soup = BeautifulSoup(html, 'lxml')
+            except Exception as e:
+                logging.warning(f"lxml failed to parse page, falling back to html.parser: {e}")
+                soup = BeautifulSoup(html, 'html.parser')
             content_block = soup.select_one(selector)
             if content_block:
                 return content_block.get_text(separator=' ', strip=True)
@@ -525,139 +837,177 @@ class JobScraperAgent:
             return ""
 
     def close(self):
-        """Closes the browser session."""
-        logging.info("Shutting down driver...")
-        if self.driver:
-            self.driver.quit()
+        """Releases the browser session to the driver pool (quit at exit or once idle too long)."""
+        logging.info("Releasing driver...")
+        if self._http_client is not None:
+            self._http_client.close()
+            self._http_client = None
+        if self._driver:
+            release_driver(self._authentication, self._driver)
+            self._driver = None
+
+    def _get_job_page_with_driver(self, url):
+        """Loads a job page in the WebDriver and returns the rendered HTML."""
+        self._pace_page_load()
+        self.driver.get(url)
+        try:
+            # Returns as soon as the description text is filled in; no fixed settle time on top
+            self.wait.until(job_description_filled)
+        except Exception as e:
+            logging.error(f"Page took too long to load: {e}")
+        
+        return self.driver.page_source
+
+    def _parse_job_details(self, job_id, url, html_source):
+        """Extracts the job metadata from a job page's HTML."""
+        # lxml.html parses and runs the (precompiled) XPath queries in C, with no Python-level tree walk
+        tree = lxml_html.fromstring(html_source)
+        # Everything but the page title lives in <main>; the whole page only for unfamiliar layouts
+        main_tags = _MAIN_XPATH(tree)
+        scope = main_tags[0] if main_tags else tree
+
+        # --- 1. EXTRACT TITLE ---
+        # Ideally, get the H1 directly rather than the page title tag
+        h1_tags = _JOB_H1_XPATH(scope)
+        job_title = _element_text(h1_tags[0], strip=True) if h1_tags else "N/A"
+        
+        # Fallback to title tag if H1 fails
+        if job_title == "N/A":
+            title_tags = _JOB_PAGE_TITLE_XPATH(tree)
+            if title_tags and title_tags[0].text:
+                job_title = title_tags[0].text.split("|")[0].strip()
+
+        # --- 2. EXTRACT COMPANY NAME & URL (FIXED) ---
+        company_name = "N/A"
+        company_linkedin_url = "N/A"
+
+        # Find the anchor tag containing '/company/' in the href
+        # We iterate to find the one that actually has text (the name), skipping the logo link if separate
+        company_links = _COMPANY_LINK_XPATH(scope)
+        
+        for link in company_links:
+            link_text = _element_text(link, strip=True)
+            # We prioritize the link that has text content (e.g., "Crossing Hurdles")
+            if link_text:
+                company_name = link_text
+                company_linkedin_url = link.get('href')
+                break
+        
+        # If we found a link but it had no text (just a logo), try to grab the URL at least
+        if company_linkedin_url == "N/A" and company_links:
+            company_linkedin_url = company_links[0].get('href')
+
+        # --- 3. EXTRACT DESCRIPTION ---
+        desc_tags = _JOB_DESCRIPTION_XPATH(scope)
+        if not desc_tags:
+            # Fallback for different page structures
+            desc_tags = _JOB_DETAILS_XPATH(scope)
+        
+        description = _element_text(desc_tags[0], separator="\n").strip() if desc_tags else "N/A"
+
+        # --- 4. METADATA (Posted date, Applicants) ---
+        metadata_text = ""
+        if main_tags:
+            # Look for the list of job insights (often styled as <li> or specific classes)
+            # Broad approach: grab text from the top card area
+            top_cards = _TOP_CARD_XPATH(scope)
+            if top_cards:
+                metadata_text = _element_text(top_cards[0], separator=" · ")
+            else:
+                # Fallback to your original method
+                for p in _PARAGRAPH_XPATH(main_tags[0]):
+                    p_text = _element_text(p)
+                    if "ago" in p_text:
+                        metadata_text = p_text
+                        break
+
+        # Parse metadata text
+        posted_date_str = "N/A"
+        applicants_count = 0
+        
+        # Normalize text to split easier
+        parts = metadata_text.replace('\n', ' ').split('·')
+
+        for part in parts:
+            part = part.strip()
+            # One C-level scan per keyword group instead of a substring test per keyword
+            if _POSTED_HINT_RE.search(part):
+                posted_date_str = part
+            elif _APPLICANTS_HINT_RE.search(part):
+                number = _DIGITS_RE.search(part)
+                applicants_count = int(number.group()) if number else 0
+
+        posted_date = parse_relative_date(posted_date_str) # Ensure this helper function exists in your class
+
+        # --- 5. APPLY BUTTON ---
+        job_application_url = "N/A"
+        apply_type = "Easy Apply" 
+
+        apply_buttons = _APPLY_BUTTON_XPATH(scope)
+
+        if apply_buttons:
+            apply_btn = apply_buttons[0]
+            raw_url = apply_btn.get('href', '')
+            btn_text = _element_text(apply_btn, separator=" ").strip().lower()
+            if "easy apply" in btn_text:
+                apply_type = "Easy Apply"
+                job_application_url = raw_url
+            else:
+                apply_type = "External Apply"
+                # LinkedIn wraps external URLs, try to clean it
+                if "url=" in raw_url:
+                    try:
+                        # You need to import unquote: from urllib.parse import unquote
+                        job_application_url = unquote(raw_url.split("url=")[1].split("&")[0])
+                    except:
+                        job_application_url = raw_url
+                else:
+                    job_application_url = raw_url
+
+        return {
+            "job_id": job_id,
+            "job_title": job_title,
+            "company_name": company_name,
+            "company_linkedin_url": company_linkedin_url,
+            "posted_date": posted_date,
+            "applicants_count": applicants_count,
+            "description": description,
+            "url": url,
+            "apply_type": apply_type,
+            "job_application_url": job_application_url
+        }
 
     def get_job_details_by_id(self, job_id):
         """
-        Navigates directly to a specific job ID and extracts detailed metadata.
+        Extracts detailed metadata for a specific job ID. With the "http" renderer the
+        page is downloaded over the agent's keep-alive HTTP client, and only loaded in
+        the WebDriver when that copy has no description.
         """
-        url = f"https://www.linkedin.com/jobs/view/{job_id}/"
-        logging.info(f"Fetching details for Job ID: {job_id}...")
-
-        try:
-            self.driver.get(url)
+        if self.site_config.get("renderer", "browser") == "http":
+            url = LINKEDIN_JOB_VIEW_URL.format(job_id=job_id)
             try:
-                # Wait for the description or the job header to load
-                self.wait.until(EC.presence_of_element_located((By.XPATH, "//*[@data-testid='expandable-text-box']")))
-                time.sleep(2) 
+                response = self._get_http_client().get(url)
+                response.raise_for_status()
+                job_details = self._parse_job_details(job_id, url, response.text)
+                if job_details["description"] != "N/A":
+                    return job_details
+                logging.info(f"Job ID {job_id} not usable over HTTP, falling back to WebDriver.")
             except Exception as e:
-                logging.error(f"Page took too long to load: {e}")
-            
-            html_source = self.driver.page_source
-            soup = BeautifulSoup(html_source, 'html.parser')
+                logging.warning(f"HTTP fetch failed for Job ID {job_id}, falling back to WebDriver: {e}")
+        return self._get_job_details_with_driver(job_id)
 
-            # --- 1. EXTRACT TITLE ---
-            # Ideally, get the H1 directly rather than the page title tag
-            h1_tag = soup.find('h1')
-            job_title = h1_tag.get_text(strip=True) if h1_tag else "N/A"
-            
-            # Fallback to title tag if H1 fails
-            if job_title == "N/A" and soup.title:
-                job_title = soup.title.string and soup.title.string.split("|")[0].strip()
-
-            # --- 2. EXTRACT COMPANY NAME & URL (FIXED) ---
-            company_name = "N/A"
-            company_linkedin_url = "N/A"
-
-            # Find the anchor tag containing '/company/' in the href
-            # We iterate to find the one that actually has text (the name), skipping the logo link if separate
-            company_links = soup.find_all('a', href=re.compile(r'/company/'))
-            
-            for link in company_links:
-                link_text = link.get_text(strip=True)
-                # We prioritize the link that has text content (e.g., "Crossing Hurdles")
-                if link_text:
-                    company_name = link_text
-                    company_linkedin_url = link['href']
-                    break
-            
-            # If we found a link but it had no text (just a logo), try to grab the URL at least
-            if company_linkedin_url == "N/A" and company_links:
-                company_linkedin_url = company_links[0]['href']
-
-            # --- 3. EXTRACT DESCRIPTION ---
-            desc_tag = soup.find(attrs={"data-testid": "expandable-text-box"})
-            if not desc_tag:
-                # Fallback for different page structures
-                desc_tag = soup.find(id="job-details")
-            
-            description = desc_tag.get_text(separator="\n").strip() if desc_tag else "N/A"
-
-            # --- 4. METADATA (Posted date, Applicants) ---
-            metadata_text = ""
-            main_content = soup.find('main')
-            if main_content:
-                # Look for the list of job insights (often styled as <li> or specific classes)
-                # Broad approach: grab text from the top card area
-                top_card = soup.find('div', class_=lambda x: x and 'top-card' in x)
-                if top_card:
-                    metadata_text = top_card.get_text(separator=" · ")
-                else:
-                    # Fallback to your original method
-                    p_tags = main_content.find_all('p')
-                    for p in p_tags:
-                        if "ago" in p.get_text():
-                            metadata_text = p.get_text()
-                            break
-
-            # Parse metadata text
-            posted_date_str = "N/A"
-            applicants_count = 0
-            
-            # Normalize text to split easier
-            parts = metadata_text.replace('\n', ' ').split('·')
-
-            for part in parts:
-                part = part.strip()
-                if any(x in part for x in ["ago", "minute", "hour", "day", "week", "month"]):
-                    posted_date_str = part
-                elif any(x in part for x in ["applicant", "people", "apply"]):
-                    numbers = re.findall(r'\d+', part)
-                    applicants_count = int(numbers[0]) if numbers else 0
-
-            posted_date = parse_relative_date(posted_date_str) # Ensure this helper function exists in your class
-
-            # --- 5. APPLY BUTTON ---
-            job_application_url = "N/A"
-            apply_type = "Easy Apply" 
-
-            apply_btn = soup.find(attrs={"data-view-name": "job-apply-button"})
-
-            if apply_btn:
-                raw_url = apply_btn.get('href', '')
-                btn_text = apply_btn.get_text(separator=" ").strip().lower()
-                if "easy apply" in btn_text:
-                    apply_type = "Easy Apply"
-                    job_application_url = raw_url
-                else:
-                    apply_type = "External Apply"
-                    # LinkedIn wraps external URLs, try to clean it
-                    if "url=" in raw_url:
-                        try:
-                            # You need to import unquote: from urllib.parse import unquote
-                            job_application_url = unquote(raw_url.split("url=")[1].split("&")[0])
-                        except:
-                            job_application_url = raw_url
-                    else:
-                        job_application_url = raw_url
+    def _get_job_details_with_driver(self, job_id):
+        """
+        Navigates directly to a specific job ID and extracts detailed metadata.
+        """
+        url = LINKEDIN_JOB_VIEW_URL.format(job_id=job_id)
+        logging.info(f"Fetching details for Job ID: {job_id}...")
 
-            job_details = {
-                "job_id": job_id,
-                "job_title": job_title,
-                "company_name": company_name,
-                "company_linkedin_url": company_linkedin_url,
-                "posted_date": posted_date,
-                "applicants_count": applicants_count,
-                "description": description,
-                "url": url,
-                "apply_type": apply_type,
-                "job_application_url": job_application_url
-            }
+        try:
+            html_source = self._get_job_page_with_driver(url)
+            job_details = self._parse_job_details(job_id, url, html_source)
             
-            logging.info(f"Successfully extracted details for {job_title}")
+            logging.info(f"Successfully extracted details for {job_details['job_title']}")
             return job_details
 
         except TimeoutException:
@@ -666,6 +1016,102 @@ class JobScraperAgent:
         except Exception as e:
             logging.error(f"Error parsing Job ID {job_id}: {e}")
             return None
+
+    def _get_http_cookies(self):
+        """
+        Returns the authenticated session cookies so HTTP fetches see the same pages as
+        the driver. Before the browser is started, only the LINKEDIN_COOKIE session is sent.
+        """
+        cookies = {}
+        if self._driver is not None:
+            try:
+                cookies = {c['name']: c['value'] for c in self._driver.get_cookies()}
+            except Exception as e:
+                logging.warning(f"Could not read cookies from driver: {e}")
+
+        if "li_at" not in cookies and os.environ.get("LINKEDIN_COOKIE"):
+            cookies["li_at"] = os.environ["LINKEDIN_COOKIE"]
+        return cookies
+
+    async def _fetch_job_html(self, client, semaphore, job_id):
+        """Fetches a single job page, holding a semaphore slot for the duration of the request."""
+        url = LINKEDIN_JOB_VIEW_URL.format(job_id=job_id)
+        async with semaphore:
+            try:
+                response = await client.get(url)
+                response.raise_for_status()
+                return response.text
+            except httpx.HTTPError as e:
+                logging.warning(f"HTTP fetch failed for Job ID {job_id}: {e}")
+                return None
+
+    async def _fetch_job_details(self, client, semaphore, job_id):
+        """
+        Downloads and parses one job page. Parsing happens as soon as this page
+        arrives, while the other downloads are still in flight.
+        Returns (page_downloaded, details or None).
+        """
+        html_source = await self._fetch_job_html(client, semaphore, job_id)
+        if not html_source:
+            return False, None
+        try:
+            return True, self._parse_job_details(job_id, LINKEDIN_JOB_VIEW_URL.format(job_id=job_id), html_source)
+        except Exception as e:
+            logging.error(f"Error parsing Job ID {job_id}: {e}")
+            return True, None
+
+    def _http_client_options(self):
+        """Settings shared by the sync and async job page clients."""
+        return dict(
+            headers={"User-Agent": get_default_user_agent(), "Accept-Language": "en-US,en;q=0.9"},
+            cookies=self._get_http_cookies(),
+            follow_redirects=True,
+            timeout=15,
+            http2=DETAIL_FETCH_HTTP2,
+            limits=DETAIL_FETCH_LIMITS,
+        )
+
+    def _get_http_client(self):
+        """Keep-alive client for one-off job page fetches, created on first use."""
+        if self._http_client is None:
+            self._http_client = httpx.Client(**self._http_client_options())
+        return self._http_client
+
+    async def _fetch_jobs_details(self, job_ids, max_concurrency):
+        semaphore = asyncio.Semaphore(max_concurrency)
+        async with httpx.AsyncClient(**self._http_client_options()) as client:
+            return await asyncio.gather(
+                *[self._fetch_job_details(client, semaphore, job_id) for job_id in job_ids]
+            )
+
+    def get_jobs_details(self, job_ids, max_concurrency=DETAIL_FETCH_CONCURRENCY):
+        """
+        Fetches the details of many jobs at once.
+
+        With the "http" renderer, job pages are downloaded concurrently over HTTP
+        (at most `max_concurrency` requests in flight). Pages that come back without
+        a description (auth wall or JS-only render) are re-loaded through the
+        WebDriver one at a time. The "browser" renderer uses the WebDriver for all.
+
+        Returns:
+            list: One details dict (or None on failure) per job ID, in input order.
+        """
+        if self.site_config.get("renderer", "browser") == "http":
+            logging.info(f"Fetching details for {len(job_ids)} jobs over HTTP (concurrency={max_concurrency})...")
+            fetched = asyncio.run(self._fetch_jobs_details(job_ids, max_concurrency))
+        else:
+            logging.info(f"Fetching details for {len(job_ids)} jobs in the browser...")
+            fetched = [(False, None)] * len(job_ids)
+
+        results = []
+        for job_id, (downloaded, job_details) in zip(job_ids, fetched):
+            if not job_details or job_details["description"] == "N/A":
+                if downloaded:
+                    logging.info(f"Job ID {job_id} not usable over HTTP, falling back to WebDriver.")
+                job_details = self._get_job_details_with_driver(job_id)
+
+            results.append(job_details)
+        return results
         
     # def get_job_details_by_id(self, job_id):
     #     """
@@ -765,10 +1211,10 @@ class JobScraperAgent:
     #         return None
 
     
-    def find_jobs(self, scraper_input: ScraperInput) -> JobResponse:
+    def find_jobs(self, scraper_input: ScraperInput, seen_ids: Optional[set] = None) -> JobResponse:
         try:
             job_search = JobSearch(driver=self.driver, close_on_complete=False, scrape=False)
-            jobs = job_search.search(scraper_input)
+            jobs = job_search.search(scraper_input, seen_ids=seen_ids)
             return jobs
         except Exception as e:
             logging.error(f"find_jobs error: {e}")            
@@ -793,13 +1239,11 @@ if __name__ == "__main__":
     jobs = agent.find_jobs(scrape_input)
     
     try:
-        results = []
-        not_easy_apply_jobs = []
-        for job  in jobs.jobs:
-            result = agent.get_job_details_by_id(job.id)
-            results.append(result)
-            if result['apply_type'] != 'Easy Apply':
-                not_easy_apply_jobs.append(result)
+        # Pages are downloaded concurrently; only unusable ones go through the browser, one by one
+        results = agent.get_jobs_details([job.id for job in jobs.jobs])
+        not_easy_apply_jobs = [
+            result for result in results if result and result['apply_type'] != 'Easy Apply'
+        ]
         breakpoint()
     except Exception as e:
         breakpoint()
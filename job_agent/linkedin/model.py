@@ -5,7 +5,7 @@ from typing import Optional
 from datetime import date
 from enum import Enum
 from typing import Any, List, Optional, Union
-from pydantic import BaseModel, field_validator
+from pydantic import BaseModel, ConfigDict, field_validator
 
 class JobType(Enum):
     FULL_TIME = (
@@ -179,6 +179,9 @@ class Country(Enum):
 
 
 class Location(BaseModel):
+    # Immutable so a single instance can be shared between job posts
+    model_config = ConfigDict(frozen=True)
+
     country:  str | None = None
     city: Optional[str] = None
     state: Optional[str] = None
@@ -1,8 +1,12 @@
+import argparse
+import asyncio
 import logging
+from concurrent.futures import ProcessPoolExecutor
 import pandas as pd
-from job_agent.linkedin.job_validator import JobValidator, filter_new_companies, filter_new_jobs
-from job_agent.linkedin.main import JobScraperAgent
+from job_agent.linkedin.job_validator import JOBS_PER_REQUEST, JobValidator, existing_job_ids, filter_new_companies, filter_new_jobs, filter_relevant_titles
+from job_agent.linkedin.main import JobScraperAgent, find_jobs_without_browser
 from job_agent.linkedin.model import Country, ScraperInput, Site, ExperienceLevel
+from job_agent.linkedin.run_store import RunStore
 from job_agent.linkedin.sheet_manager import GoogleSheetManager
 
 # --- Configuration ---
@@ -10,6 +14,23 @@ SHEET_FILE_NAME = "My AI Job Tracker"
 TAB_ALL_JOBS = "All Jobs"
 TAB_COMPANIES = "Companies"
 TAB_VALIDATED = "Validated Jobs"
+# Each search worker runs its own Chrome instance, so keep this small.
+MAX_SEARCH_WORKERS = 4
+# Concurrent LLM analysers and how many validated rows to buffer per sheet write.
+ANALYSE_WORKERS = 20
+WRITE_BATCH_SIZE = 25
+
+# Column headers of the validated jobs tab
+VALIDATED_JOBS_COLUMNS = [
+    "job_title", "company_name", "job_application_url", 'url', "is_fit", 
+    'confidence_score', 'skill_matching_perc', 'is_experience_year_less_3', 
+    'is_work_mode_valid', 'is_salary_valid', 'is_geo_valid', 'is_not_saturated',
+    'does_hired_from_africa', 'does_hired_from_ethiopia', 'is_company_legit', 
+    'is_job_post_legit', 'reason', 'job_min_experience_years',
+    'job_work_model', 'relocation_offered', 'job_max_salary', 'geographic_restrictions', 
+    'applicants_count', 'company_people_locations', 'required_skills', 'missing_skills', 'red_flags'
+]
+COMPANIES_COLUMNS = ["company_name", "company_linkedin_url", "company_people_locations"]
 
 # --- Logging Setup ---
 logging.basicConfig(
@@ -29,17 +50,75 @@ def safe_read_sheet(manager: GoogleSheetManager, tab_name: str) -> pd.DataFrame:
         logger.warning(f"Could not read sheet '{tab_name}' (might be empty or missing): {e}")
         return pd.DataFrame()
 
+def search_keyword_worker(search_term, known_ids=frozenset()):
+    """
+    Runs one keyword search in its own process. The results listing is read over
+    plain HTTP first; only if that comes back empty does the worker start a
+    browser. Selenium drivers are neither thread-safe nor picklable, so every
+    worker logs in with its own agent. Jobs in `known_ids` are skipped on the
+    results page itself.
+    """
+    scrape_input = ScraperInput(
+        site_type=[Site.LINKEDIN],
+        search_term=search_term,
+        country=Country.WORLDWIDE,
+        location='worldwide',
+        is_remote=True,
+        easy_apply=False,
+        hours_old=24,
+        results_wanted=5,
+        experience_level=[ExperienceLevel.ENTRY_LEVEL, ExperienceLevel.ASSOCIATE, ExperienceLevel.MID_SENIOR_LEVEL]
+    )
+    jobs = find_jobs_without_browser(scrape_input, seen_ids=set(known_ids)).jobs
+    if jobs:
+        return jobs
+
+    agent = JobScraperAgent()
+    try:
+        return agent.find_jobs(scrape_input, seen_ids=set(known_ids)).jobs
+    finally:
+        agent.close()
+
+def search_jobs_parallel(keywords, known_ids=frozenset()):
+    """Searches all keywords concurrently and returns the de-duplicated job posts not in `known_ids`."""
+    all_job_ids = set()
+    found_job_objects = []
+
+    with ProcessPoolExecutor(max_workers=min(MAX_SEARCH_WORKERS, len(keywords))) as executor:
+        futures = {search_term: executor.submit(search_keyword_worker, search_term, known_ids) for search_term in keywords}
+
+        for search_term, future in futures.items():
+            try:
+                jobs = future.result()
+
+                count = 0
+                for job in jobs:
+                    if job.id not in all_job_ids:
+                        all_job_ids.add(job.id)
+                        found_job_objects.append(job)
+                        count += 1
+                logger.info(f"Found {count} new unique jobs for term: {search_term}")
+
+            except Exception as e:
+                logger.error(f"Search failed for keyword '{search_term}': {e}")
+                continue
+
+    return found_job_objects
+
 def fetch_job_details_safely(agent, new_jobs_to_process):
     """Iterates through jobs and fetches details, skipping failures."""
     job_details_list = []
     
     logger.info(f"Attempting to fetch details for {len(new_jobs_to_process)} jobs...")
-    
-    for job in new_jobs_to_process:
+
+    # Fetch all pages concurrently; failures come back as None
+    fetched_details = agent.get_jobs_details([job.id for job in new_jobs_to_process])
+
+    for job, job_detail in zip(new_jobs_to_process, fetched_details):
         try:
-            # Fetch details
-            job_detail = agent.get_job_details_by_id(job.id)
-            
+            if not job_detail:
+                raise ValueError("No details returned")
+
             # Basic enrichment
             if job.location:
                 job_detail['job_location_scraped_from_linkedin'] = (
@@ -58,6 +137,27 @@ def fetch_job_details_safely(agent, new_jobs_to_process):
 
     return job_details_list
 
+def scrape_company_locations(agent, company):
+    """Scrapes one company's people-location stats. Returns them as a string, or None on failure."""
+    comp_url = company.get('company_linkedin_url')
+    comp_name = company.get('company_name')
+    try:
+        if not comp_url:
+            raise ValueError("Missing Company URL")
+        return str(agent.scrape_company_location_stats(comp_url))
+    except Exception as e:
+        logger.error(f"Failed to scrape stats for company '{comp_name}': {e}")
+        return None
+
+def build_companies_loc_mapper(companies_df):
+    """Maps company name -> people locations string from the companies sheet."""
+    companies_loc_mapper = {}
+    for comp in companies_df.to_dict(orient='records'):
+        c_name = comp.get('company_name')
+        if c_name:
+            companies_loc_mapper[c_name] = comp.get('company_people_locations', "{}")
+    return companies_loc_mapper
+
 def update_company_stats(agent, manager, job_details_list, companies_df):
     """
     Identifies new companies, scrapes their stats, updates the sheet, 
@@ -73,37 +173,23 @@ def update_company_stats(agent, manager, job_details_list, companies_df):
     for company in new_companies_to_process:
         comp_url = company.get('company_linkedin_url')
         comp_name = company.get('company_name')
-        
-        try:
-            if not comp_url:
-                raise ValueError("Missing Company URL")
+        loc_str = scrape_company_locations(agent, company)
 
-            company_people_locations = agent.scrape_company_location_stats(comp_url)
-            loc_str = str(company_people_locations)
-            
+        if loc_str is not None:
             companies_data_rows.append([comp_name, comp_url, loc_str])
-            new_companies_list_dicts.append({
-                "company_name": comp_name, 
-                "company_linkedin_url": comp_url, 
-                "company_people_locations": loc_str
-            })
-            
-        except Exception as e:
-            logger.error(f"Failed to scrape stats for company '{comp_name}': {e}")
-            # We create a placeholder so the job processing doesn't fail later
-            new_companies_list_dicts.append({
-                "company_name": comp_name, 
-                "company_linkedin_url": comp_url, 
-                "company_people_locations": "{}"
-            })
-            continue
+        new_companies_list_dicts.append({
+            "company_name": comp_name, 
+            "company_linkedin_url": comp_url, 
+            # We create a placeholder on failure so the job processing doesn't fail later
+            "company_people_locations": loc_str if loc_str is not None else "{}"
+        })
 
     # 1. Update Google Sheet with new companies
     if companies_data_rows:
         try:
             manager.append_rows(
                 tab_name=TAB_COMPANIES, 
-                headers=["company_name", "company_linkedin_url", "company_people_locations"], 
+                headers=COMPANIES_COLUMNS, 
                 rows=companies_data_rows
             )
             logger.info(f"Saved {len(companies_data_rows)} new companies to sheet.")
@@ -112,145 +198,261 @@ def update_company_stats(agent, manager, job_details_list, companies_df):
 
     # 2. Merge old and new data to create the mapper
     all_companies_df = pd.concat([companies_df, pd.DataFrame(new_companies_list_dicts)], ignore_index=True)
-    companies_dict = all_companies_df.to_dict(orient='records')
-    
-    # Create Mapper
-    companies_loc_mapper = {}
-    for comp in companies_dict:
-        # FIX: ensure we handle missing keys safely
-        c_name = comp.get('company_name')
-        if c_name:
-            companies_loc_mapper[c_name] = comp.get('company_people_locations', "{}")
-            
-    return companies_loc_mapper
+    return build_companies_loc_mapper(all_companies_df)
 
-def validate_and_prepare_jobs(job_details_list, companies_loc_mapper, cv_summary):
-    """Runs the validation logic on every job safely."""
+def build_validated_row(job, validations):
+    """Builds one 'Validated Jobs' row, in VALIDATED_JOBS_COLUMNS order."""
+    return [
+        job.get("job_title"), job.get('company_name'), job.get('job_application_url'), job.get('url'),
+        validations.get('is_fit'), validations.get('confidence_score'), validations.get('skill_matching_perc'),
+        validations.get('is_experience_year_less_3'), validations.get('is_work_mode_valid'),
+        validations.get('is_salary_valid'), validations.get('is_geo_valid'), validations.get('is_not_saturated'),
+        validations.get('does_hired_from_africa'), validations.get('does_hired_from_ethiopia'), 
+        validations.get('is_company_legit'), validations.get('is_job_post_legit'), validations.get('reason'), 
+        validations.get('job_min_experience_years'), validations.get('job_work_model'), 
+        validations.get('relocation_offered'), validations.get('job_max_salary'),
+        validations.get('geographic_restrictions'), validations.get('applicants_count'), 
+        validations.get('company_people_locations'), validations.get('required_skills'), 
+        validations.get('missing_skills'), validations.get('red_flags')
+    ]
+
+def validate_and_prepare_jobs(job_details_list, companies_loc_mapper, cv_summary, batch_mode=False, store=None):
+    """Runs the validation logic on every job safely, recording each row in the run store if given."""
     validator = JobValidator(cv_summary)
     jobs_to_save = []
-    
-    # Column headers definition
-    jobs_col = [
-        "job_title", "company_name", "job_application_url", 'url', "is_fit", 
-        'confidence_score', 'skill_matching_perc', 'is_experience_year_less_3', 
-        'is_work_mode_valid', 'is_salary_valid', 'is_geo_valid', 'is_not_saturated',
-        'does_hired_from_africa', 'does_hired_from_ethiopia', 'is_company_legit', 
-        'is_job_post_legit', 'reason', 'job_min_experience_years',
-        'job_work_model', 'relocation_offered', 'job_max_salary', 'geographic_restrictions', 
-        'applicants_count', 'company_people_locations', 'required_skills', 'missing_skills', 'red_flags'
-    ]
 
+    # Enrich with company location data
     for job in job_details_list:
-        try:
-            # Enrich with company location data
-            comp_name = job.get('company_name')
-            job['company_people_locations'] = companies_loc_mapper.get(comp_name, "{}")
+        comp_name = job.get('company_name')
+        job['company_people_locations'] = companies_loc_mapper.get(comp_name, "{}")
 
-            # Run Validation
-            validations = validator.validate_job(job)
-            
+    # Run Validation (LLM calls are issued concurrently, rate-limited, or as one Batch API job)
+    if batch_mode:
+        all_validations = validator.validate_jobs_batch(job_details_list)
+    else:
+        all_validations = validator.validate_jobs(job_details_list)
+
+    for job, validations in zip(job_details_list, all_validations):
+        try:
             # Prepare row
-            jobs_to_save.append([
-                job.get("job_title"), job.get('company_name'), job.get('job_application_url'), job.get('url'),
-                validations.get('is_fit'), validations.get('confidence_score'), validations.get('skill_matching_perc'),
-                validations.get('is_experience_year_less_3'), validations.get('is_work_mode_valid'),
-                validations.get('is_salary_valid'), validations.get('is_geo_valid'), validations.get('is_not_saturated'),
-                validations.get('does_hired_from_africa'), validations.get('does_hired_from_ethiopia'), 
-                validations.get('is_company_legit'), validations.get('is_job_post_legit'), validations.get('reason'), 
-                validations.get('job_min_experience_years'), validations.get('job_work_model'), 
-                validations.get('relocation_offered'), validations.get('job_max_salary'),
-                validations.get('geographic_restrictions'), validations.get('applicants_count'), 
-                validations.get('company_people_locations'), validations.get('required_skills'), 
-                validations.get('missing_skills'), validations.get('red_flags')
-            ])
+            row = build_validated_row(job, validations)
+            if store is not None:
+                store.save_validated(job['job_id'], validations, row)
+            jobs_to_save.append(row)
         except Exception as e:
             logger.error(f"Error validating job '{job.get('job_title', 'Unknown')}': {e}")
             continue
 
-    return jobs_col, jobs_to_save
+    return VALIDATED_JOBS_COLUMNS, jobs_to_save
 
-def main():
-    agent = JobScraperAgent()
-    manager = GoogleSheetManager(SHEET_FILE_NAME)
+async def run_validation_pipeline(agent, manager, job_details_list, companies_df, cv_summary, store):
+    """
+    Overlaps the three slow stages instead of running them back to back:
+    company stats scraping (Selenium, in a worker thread) feeds jobs into the
+    LLM analysers as soon as their company is known, and validated rows are
+    written to the sheet in small batches while analysis continues. Every row
+    is saved to the run store first and only marked synced once the sheet
+    write succeeds.
 
-    # 1. Search Phase
-    keywords = ['AI Engineer', "Generative AI Engineer", "AI Agent Engineer", "Python Developer", "Software Engineer"]
-    all_job_ids = set()
-    found_job_objects = []
+    Returns:
+        int: Number of validated rows written.
+    """
+    # Construction makes a blocking OpenAI call (CV embedding) and may download the
+    # tokenizer, so it runs in a worker thread rather than stalling the event loop
+    validator = await asyncio.to_thread(JobValidator, cv_summary)
+    analyse_q = asyncio.Queue()
+    write_q = asyncio.Queue()
+    companies_loc_mapper = build_companies_loc_mapper(companies_df)
 
-    logger.info("Starting Job Search...")
-    for search_term in keywords:
+    async def producer_enrich():
+        # Jobs whose company is already known go straight to analysis
+        new_company_names = {c['company_name'] for c in filter_new_companies(job_details_list, companies_df)}
+        waiting = {}
+        for job in job_details_list:
+            comp_name = job.get('company_name')
+            if comp_name in new_company_names:
+                waiting.setdefault(comp_name, []).append(job)
+            else:
+                job['company_people_locations'] = companies_loc_mapper.get(comp_name, "{}")
+                await analyse_q.put(job)
+
+        logger.info(f"Found {len(waiting)} new companies to analyze.")
+        companies_data_rows = []
+        for comp_name, jobs in waiting.items():
+            loc_str = await asyncio.to_thread(scrape_company_locations, agent, jobs[0])
+            if loc_str is not None:
+                companies_data_rows.append([comp_name, jobs[0].get('company_linkedin_url'), loc_str])
+            for job in jobs:
+                job['company_people_locations'] = loc_str if loc_str is not None else "{}"
+                await analyse_q.put(job)
+
+        for _ in range(ANALYSE_WORKERS):
+            await analyse_q.put(None)
+
+        if companies_data_rows:
+            try:
+                await asyncio.to_thread(
+                    manager.append_rows, tab_name=TAB_COMPANIES, headers=COMPANIES_COLUMNS, rows=companies_data_rows
+                )
+                logger.info(f"Saved {len(companies_data_rows)} new companies to sheet.")
+            except Exception as e:
+                logger.error(f"Failed to save companies to sheet: {e}")
+
+    async def consumer_analyse(client):
+        while (job := await analyse_q.get()) is not None:
+            # Take whatever else is already queued, so one LLM request covers several jobs
+            group = [job]
+            while len(group) < JOBS_PER_REQUEST:
+                try:
+                    next_job = analyse_q.get_nowait()
+                except asyncio.QueueEmpty:
+                    break
+                if next_job is None:
+                    analyse_q.put_nowait(None)
+                    break
+                group.append(next_job)
+
+            try:
+                all_validations = await validator.validate_jobs_async(client, group)
+                for grouped_job, validations in zip(group, all_validations):
+                    row = build_validated_row(grouped_job, validations)
+                    store.save_validated(grouped_job['job_id'], validations, row)
+                    await write_q.put((grouped_job['job_id'], row))
+            except Exception as e:
+                logger.error(f"Error validating jobs {[j.get('job_title', 'Unknown') for j in group]}: {e}")
+
+    async def consumer_write():
+        written = 0
+        buffer = []
+        while True:
+            item = await write_q.get()
+            if item is not None:
+                buffer.append(item)
+            if buffer and (item is None or len(buffer) >= WRITE_BATCH_SIZE):
+                saved = await asyncio.to_thread(
+                    manager.append_rows,
+                    tab_name=TAB_VALIDATED, headers=VALIDATED_JOBS_COLUMNS, rows=[row for _, row in buffer]
+                )
+                # Rows past `saved` didn't land; they stay unsynced in the store and are retried on the next run
+                store.mark_synced(job_id for job_id, _ in buffer[:saved])
+                written += saved
+                buffer = []
+            if item is None:
+                return written
+
+    async with validator.async_client() as client:
+        # One batched embeddings pass for every job before analysis starts
+        await validator.embed_jobs_async(client, job_details_list)
+        writer = asyncio.create_task(consumer_write())
+        await asyncio.gather(
+            producer_enrich(),
+            *[consumer_analyse(client) for _ in range(ANALYSE_WORKERS)]
+        )
+        await write_q.put(None)
+        written = await writer
+
+    validator.fit_cache.log_stats()
+    return written
+
+def log_all_jobs(manager, jobs):
+    """Appends the processed jobs to the 'All Jobs' tab, so later runs skip them."""
+    jobs_log_rows = []
+    for job in jobs:
+        jobs_log_rows.append([job.id, job.title, job.company_name, job.job_url])
+    
+    if jobs_log_rows:
         try:
-            scrape_input = ScraperInput(
-                site_type=[Site.LINKEDIN],
-                search_term=search_term,
-                country=Country.WORLDWIDE,
-                location='worldwide',
-                is_remote=True,
-                easy_apply=False,
-                hours_old=24,
-                results_wanted=5,
-                experience_level=[ExperienceLevel.ENTRY_LEVEL, ExperienceLevel.ASSOCIATE, ExperienceLevel.MID_SENIOR_LEVEL]
-            )
-            
-            jobs = agent.find_jobs(scrape_input)
-            
-            count = 0
-            for job in jobs.jobs:
-                if job.id not in all_job_ids:
-                    all_job_ids.add(job.id)
-                    found_job_objects.append(job)
-                    count += 1
-            logger.info(f"Found {count} new unique jobs for term: {search_term}")
-            
+            manager.append_rows(tab_name=TAB_ALL_JOBS, headers=["id", "title", "company_name", "job_url"], rows=jobs_log_rows)
+            logger.info("Updated 'All Jobs' tracker sheet.")
         except Exception as e:
-            logger.error(f"Search failed for keyword '{search_term}': {e}")
-            continue
+            logger.error(f"Failed to update 'All Jobs' sheet: {e}")
+
+def main(batch_mode=False):
+    manager = GoogleSheetManager(SHEET_FILE_NAME)
+    store = RunStore()
+
+    # 0. Push rows a previous (crashed) run validated but never got into the sheet
+    resynced = store.sync_to_sheets(manager, TAB_VALIDATED, VALIDATED_JOBS_COLUMNS)
+    if resynced:
+        logger.info(f"Synced {resynced} validated jobs left over from a previous run.")
 
-    # 2. Read Existing Data & Filter
+    # 1. Search Phase (one browser process per keyword)
+    keywords = ['AI Engineer', "Generative AI Engineer", "AI Agent Engineer", "Python Developer", "Software Engineer"]
+
+    # Jobs already in the sheet are skipped while reading the results pages, so
+    # results_wanted counts new jobs only
     df_existing_jobs = safe_read_sheet(manager, TAB_ALL_JOBS)
-    new_jobs_to_process = filter_new_jobs(found_job_objects, df_existing_jobs)
+    existing_ids = existing_job_ids(df_existing_jobs)
+    logger.info(f"Loaded {len(existing_ids)} existing job IDs from the sheet.")
+
+    logger.info("Starting Job Search...")
+    found_job_objects = search_jobs_parallel(keywords, existing_ids)
+
+    # 2. Filter (authoritative check against the sheet)
+    new_jobs_to_process = filter_new_jobs(found_job_objects, existing_ids=existing_ids)
 
     if not new_jobs_to_process:
         logger.info("No new jobs to process after filtering. Exiting.")
         return
 
-    # 3. Fetch Details (Resilient Loop)
-    job_details_list = fetch_job_details_safely(agent, new_jobs_to_process)
+    # 3. Fetch Details (Resilient Loop), skipping jobs already validated by an earlier run.
+    # Titles that clearly don't fit are dropped first; they still go to 'All Jobs' so
+    # later runs skip them too.
+    relevant_jobs = filter_relevant_titles(new_jobs_to_process, keywords)
+    store.record_jobs(relevant_jobs)
+    validated_ids = store.validated_ids()
+    jobs_to_fetch = [job for job in relevant_jobs if str(job.id) not in validated_ids]
+    if len(jobs_to_fetch) < len(relevant_jobs):
+        logger.info(f"Skipping {len(relevant_jobs) - len(jobs_to_fetch)} jobs already validated in an earlier run.")
+    if not jobs_to_fetch:
+        logger.info("No jobs left to fetch after the title pre-filter.")
+        log_all_jobs(manager, new_jobs_to_process)
+        return
+
+    agent = JobScraperAgent()
+    job_details_list = fetch_job_details_safely(agent, jobs_to_fetch)
 
     if not job_details_list:
         logger.warning("No job details could be successfully fetched. Exiting.")
         return
 
-    # 4. Company Stats Processing
     companies_df = safe_read_sheet(manager, TAB_COMPANIES)
-    companies_loc_mapper = update_company_stats(agent, manager, job_details_list, companies_df)
-
-    # 5. Validation & Preparation
     cv_summary = manager.extract_text_from_drive_pdf("resume.pdf", is_file_id=False)
-    headers, rows_to_save = validate_and_prepare_jobs(job_details_list, companies_loc_mapper, cv_summary)
 
-    # 6. Save Validated Jobs
-    if rows_to_save:
-        try:
-            manager.append_rows(tab_name=TAB_VALIDATED, headers=headers, rows=rows_to_save)
-            logger.info(f"Successfully saved {len(rows_to_save)} validated jobs to '{TAB_VALIDATED}'.")
-        except Exception as e:
-            logger.error(f"Failed to save validated jobs: {e}")
+    if batch_mode:
+        # 4. Company Stats Processing
+        companies_loc_mapper = update_company_stats(agent, manager, job_details_list, companies_df)
+
+        # 5. Validation & Preparation
+        headers, rows_to_save = validate_and_prepare_jobs(
+            job_details_list, companies_loc_mapper, cv_summary, batch_mode=batch_mode, store=store
+        )
+
+        # 6. Save Validated Jobs (from the run store, so failed writes are retried next run)
+        if rows_to_save:
+            written = store.sync_to_sheets(manager, TAB_VALIDATED, headers)
+            if written:
+                logger.info(f"Successfully saved {written} validated jobs to '{TAB_VALIDATED}'.")
+            else:
+                logger.error("Failed to save validated jobs; they stay in the run store for the next run.")
+        else:
+            logger.info("No jobs passed validation or processing.")
     else:
-        logger.info("No jobs passed validation or processing.")
+        # 4-6. Company stats, validation and saving, pipelined
+        written = asyncio.run(run_validation_pipeline(agent, manager, job_details_list, companies_df, cv_summary, store))
+        if written:
+            logger.info(f"Successfully saved {written} validated jobs to '{TAB_VALIDATED}'.")
+        else:
+            logger.info("No jobs passed validation or processing.")
 
     # 7. Update 'All Jobs' Log (Last step to ensure we tracked what we processed)
-    jobs_log_rows = []
-    for job in new_jobs_to_process:
-        jobs_log_rows.append([job.id, job.title, job.company_name, job.job_url])
-    
-    if jobs_log_rows:
-        try:
-            manager.append_rows(tab_name=TAB_ALL_JOBS, headers=["id", "title", "company_name", "job_url"], rows=jobs_log_rows)
-            logger.info("Updated 'All Jobs' tracker sheet.")
-        except Exception as e:
-            logger.error(f"Failed to update 'All Jobs' sheet: {e}")
+    log_all_jobs(manager, new_jobs_to_process)
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Search, validate and track LinkedIn jobs.")
+    parser.add_argument(
+        "--batch", action="store_true",
+        help="Validate jobs through the OpenAI Batch API (cheaper, results can take up to 24h)."
+    )
+    args = parser.parse_args()
+    main(batch_mode=args.batch)
@@ -0,0 +1,72 @@
+import asyncio
+import logging
+import time
+from typing import Optional
+
+# Get a logger for this module
+logger = logging.getLogger(__name__)
+
+# After a 429 the bucket runs at half rate for this long, then recovers linearly over the same period.
+THROTTLE_SECONDS = 60
+
+
+class TokenBucket:
+    """
+    Async token bucket for proactive rate limiting: refills continuously at
+    `rate_per_minute / 60` units per second up to `capacity`, and callers await
+    `acquire(n)` before sending a request instead of finding out via a 429.
+    """
+
+    def __init__(
+        self,
+        rate_per_minute: float,
+        capacity: Optional[float] = None,
+        name: str = "bucket",
+    ):
+        self.name = name
+        self.base_rate = rate_per_minute / 60.0
+        self.capacity = capacity if capacity is not None else rate_per_minute
+        self.tokens = self.capacity
+        self.last_refill = time.monotonic()
+        self.throttled_at: Optional[float] = None
+
+    @property
+    def rate(self) -> float:
+        """Current refill rate (units/second), reduced for a while after a 429."""
+        if self.throttled_at is None:
+            return self.base_rate
+        elapsed = time.monotonic() - self.throttled_at
+        if elapsed < THROTTLE_SECONDS:
+            return self.base_rate / 2
+        if elapsed < 2 * THROTTLE_SECONDS:
+            recovered = (elapsed - THROTTLE_SECONDS) / THROTTLE_SECONDS
+            return self.base_rate * (0.5 + 0.5 * recovered)
+        self.throttled_at = None
+        return self.base_rate
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(
+            self.capacity, self.tokens + (now - self.last_refill) * self.rate
+        )
+        self.last_refill = now
+
+    async def acquire(self, amount: float = 1):
+        """Waits until `amount` units are available, then consumes them."""
+        # A single request larger than the bucket could never be served otherwise
+        amount = min(amount, self.capacity)
+        while True:
+            self._refill()
+            if self.tokens >= amount:
+                self.tokens -= amount
+                return
+            await asyncio.sleep(max((amount - self.tokens) / self.rate, 0.01))
+
+    def penalize(self):
+        """Called on a 429: halve the rate for THROTTLE_SECONDS, then recover linearly."""
+        self._refill()
+        if self.throttled_at is None:
+            logger.warning(
+                f"Rate limit hit, slowing '{self.name}' to half rate for {THROTTLE_SECONDS}s."
+            )
+        self.throttled_at = time.monotonic()
@@ -0,0 +1,99 @@
+import logging
+import os
+import sqlite3
+import time
+from typing import Any, Iterable, List, Set, Tuple
+
+import orjson
+
+from job_agent.linkedin.cache import CACHE_DIR
+from job_agent.linkedin.model import JobPost
+
+# Get a logger for this module
+logger = logging.getLogger(__name__)
+
+RUN_STORE_PATH = os.path.join(CACHE_DIR, "runs.sqlite")
+
+
+class RunStore:
+    """
+    Local SQLite record of every job a run has seen and the validated row it
+    produced. Rows are written here first and synced to Google Sheets after, so
+    a crashed run can resume without re-fetching or re-analysing finished jobs.
+    """
+
+    def __init__(self, path: str = RUN_STORE_PATH):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            "job_id TEXT PRIMARY KEY, url TEXT, title TEXT, company_name TEXT, "
+            "is_fit INTEGER, confidence REAL, reason TEXT, row TEXT, "
+            "synced INTEGER NOT NULL DEFAULT 0, seen_at REAL NOT NULL, validated_at REAL)"
+        )
+        self.conn.commit()
+
+    def record_jobs(self, jobs: Iterable[JobPost]):
+        """Registers scraped jobs; jobs already known are left untouched."""
+        now = time.time()
+        self.conn.executemany(
+            "INSERT OR IGNORE INTO jobs (job_id, url, title, company_name, seen_at) VALUES (?, ?, ?, ?, ?)",
+            [
+                (str(job.id), job.job_url, job.title, job.company_name, now)
+                for job in jobs
+            ],
+        )
+        self.conn.commit()
+
+    def validated_ids(self) -> Set[str]:
+        rows = self.conn.execute(
+            "SELECT job_id FROM jobs WHERE validated_at IS NOT NULL"
+        ).fetchall()
+        return {job_id for (job_id,) in rows}
+
+    def save_validated(self, job_id: str, validations: dict, row: List[Any]):
+        """Stores the validated sheet row for a job (unsynced until mark_synced)."""
+        self.conn.execute(
+            "INSERT INTO jobs (job_id, seen_at) VALUES (?, ?) ON CONFLICT(job_id) DO NOTHING",
+            (str(job_id), time.time()),
+        )
+        self.conn.execute(
+            "UPDATE jobs SET is_fit = ?, confidence = ?, reason = ?, row = ?, synced = 0, validated_at = ? "
+            "WHERE job_id = ?",
+            (
+                validations.get("is_fit"),
+                validations.get("confidence_score"),
+                validations.get("reason"),
+                orjson.dumps(row, default=str).decode(),
+                time.time(),
+                str(job_id),
+            ),
+        )
+        self.conn.commit()
+
+    def unsynced_rows(self) -> List[Tuple[str, List[Any]]]:
+        rows = self.conn.execute(
+            "SELECT job_id, row FROM jobs WHERE validated_at IS NOT NULL AND synced = 0 ORDER BY validated_at"
+        ).fetchall()
+        return [(job_id, orjson.loads(row)) for job_id, row in rows]
+
+    def mark_synced(self, job_ids: Iterable[str]):
+        self.conn.executemany(
+            "UPDATE jobs SET synced = 1 WHERE job_id = ?",
+            [(str(job_id),) for job_id in job_ids],
+        )
+        self.conn.commit()
+
+    def sync_to_sheets(self, manager, tab_name: str, headers: List[str]) -> int:
+        """
+        Appends every unsynced validated row to the sheet in one call. Returns the number
+        synced; after a partial write only the rows that landed are marked synced.
+        """
+        pending = self.unsynced_rows()
+        if not pending:
+            return 0
+        written = manager.append_rows(
+            tab_name=tab_name, headers=headers, rows=[row for _, row in pending]
+        )
+        self.mark_synced(job_id for job_id, _ in pending[:written])
+        return written
@@ -10,6 +10,9 @@ import io
 # Set up a logger for this module
 logger = logging.getLogger(__name__)
 
+# Rows sent per append request, keeps each call well under the Sheets 10 MB payload cap.
+APPEND_CHUNK_SIZE = 500
+
 class GoogleSheetManager:
     """
     A dedicated class to handle all Google Sheets API interactions,
@@ -31,6 +34,10 @@ class GoogleSheetManager:
             self.spreadsheet = self.client.open(spreadsheet_name)
             
             self.drive_service = build('drive', 'v3', credentials=self.credentials)
+            # Tabs whose header row is known to exist; skips the A1 read on later appends
+            self._tabs_with_headers = set()
+            # Worksheet handles by tab name; each lookup is a spreadsheet metadata request
+            self._worksheets: Dict[str, gspread.Worksheet] = {}
             
             logger.info("Successfully connected to Google Spreadsheet.")
         except gspread.exceptions.SpreadsheetNotFound:
@@ -145,16 +152,22 @@ class GoogleSheetManager:
     def _get_or_create_worksheet(self, tab_name: str) -> gspread.Worksheet:
         """
         Gets a worksheet by its tab name. If it doesn't exist, creates it.
+        The handle is looked up once per tab and reused by later calls.
         """
+        worksheet = self._worksheets.get(tab_name)
+        if worksheet is not None:
+            return worksheet
         try:
             # Try to get the worksheet
-            return self.spreadsheet.worksheet(tab_name)
+            worksheet = self.spreadsheet.worksheet(tab_name)
         except gspread.exceptions.WorksheetNotFound:
             # Create it if it doesn't exist
             logger.info(f"Worksheet '{tab_name}' not found. Creating it...")
-            return self.spreadsheet.add_worksheet(title=tab_name, rows=100, cols=20)
+            worksheet = self.spreadsheet.add_worksheet(title=tab_name, rows=100, cols=20)
+        self._worksheets[tab_name] = worksheet
+        return worksheet
 
-    def append_rows(self, tab_name: str, rows: List[List[Any]], headers: Optional[List[str]] = None):
+    def append_rows(self, tab_name: str, rows: List[List[Any]], headers: Optional[List[str]] = None) -> int:
         """
         Appends one or more rows to a specific tab.
         
@@ -166,29 +179,41 @@ class GoogleSheetManager:
             rows (List[List[Any]]): A list of rows to append. 
                                     Example: [["val1", "val2"], ["valA", "valB"]]
             headers (Optional[List[str]]): A list of header strings.
+
+        Returns:
+            int: How many of `rows` were written. Rows go out in chunks of
+                 APPEND_CHUNK_SIZE, so after a failure this is the leading
+                 `rows[:count]` that landed, and the rest were not written.
         """
         if not rows and not headers:
             logger.warning(f"No data or headers provided for tab '{tab_name}'. Nothing to do.")
-            return
+            return 0
 
+        written = 0
         try:
             worksheet = self._get_or_create_worksheet(tab_name)
             
-            # Check for headers if provided
-            if headers:
+            # Check for headers if provided (once per tab; rows are only ever appended below them)
+            if headers and tab_name not in self._tabs_with_headers:
                 first_cell = worksheet.acell('A1').value
                 if not first_cell:
                     logger.info(f"Setting headers for new tab '{tab_name}'...")
                     # worksheet.update('A1', [headers], value_input_option='USER_ENTERED')
                     worksheet.update(range_name='A1', values=[headers], value_input_option='USER_ENTERED')
+                self._tabs_with_headers.add(tab_name)
             
-            # Append the data rows
+            # Append the data rows, one request per chunk
+            for start in range(0, len(rows), APPEND_CHUNK_SIZE):
+                chunk = rows[start:start + APPEND_CHUNK_SIZE]
+                worksheet.append_rows(chunk, value_input_option='USER_ENTERED')
+                written += len(chunk)
             if rows:
-                worksheet.append_rows(rows, value_input_option='USER_ENTERED')
                 logger.info(f"Appended {len(rows)} rows to tab '{tab_name}'.")
+            return written
 
         except Exception as e:
-            logger.error(f"Failed to append rows to tab '{tab_name}': {e}")
+            logger.error(f"Failed to append rows to tab '{tab_name}' ({written}/{len(rows)} written): {e}")
+            return written
             
     def read_sheet(self, tab_name: str) -> List[Dict[str, Any]]:
         """
@@ -203,7 +228,8 @@ class GoogleSheetManager:
                                   Returns an empty list if the tab is not found.
         """
         try:
-            worksheet = self.spreadsheet.worksheet(tab_name)
+            worksheet = self._worksheets.get(tab_name) or self.spreadsheet.worksheet(tab_name)
+            self._worksheets[tab_name] = worksheet
             logger.info(f"Reading all data from tab '{tab_name}'...")
             return worksheet.get_all_records()
         except gspread.exceptions.WorksheetNotFound:
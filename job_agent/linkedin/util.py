@@ -28,27 +28,31 @@ def extract_pdf_text(pdf_path: str) -> str:
         logging.error(f"Failed to read PDF: {e}")
         return ""
     
+# LinkedIn search filter codes; built once instead of on every call.
+JOB_TYPE_CODES = {
+    JobType.FULL_TIME: "F",
+    JobType.PART_TIME: "P",
+    JobType.INTERNSHIP: "I",
+    JobType.CONTRACT: "C",
+    JobType.TEMPORARY: "T",
+}
+EXPERIENCE_LEVEL_CODES = {
+    ExperienceLevel.INTERNSHIP: "1",
+    ExperienceLevel.ENTRY_LEVEL: "2",
+    ExperienceLevel.ASSOCIATE: "3",
+    ExperienceLevel.MID_SENIOR_LEVEL: "4",
+    ExperienceLevel.DIRECTOR: "5",
+    ExperienceLevel.EXECUTIVE: "6",
+}
+
+
 def job_type_code(job_type_enum: JobType) -> str:
-    return {
-        JobType.FULL_TIME: "F",
-        JobType.PART_TIME: "P",
-        JobType.INTERNSHIP: "I",
-        JobType.CONTRACT: "C",
-        JobType.TEMPORARY: "T",
-    }.get(job_type_enum, "")
+    return JOB_TYPE_CODES.get(job_type_enum, "")
 
 
 def experience_level_code(experience_level_enum: ExperienceLevel) -> str:
-    return {
-        ExperienceLevel.INTERNSHIP: "1",
-        ExperienceLevel.ENTRY_LEVEL: "2",
-        ExperienceLevel.ASSOCIATE: "3",
-        ExperienceLevel.MID_SENIOR_LEVEL: "4",
-        ExperienceLevel.DIRECTOR: "5",
-        ExperienceLevel.EXECUTIVE: "6",
-        
-    }.get(experience_level_enum, "")
-    
+    return EXPERIENCE_LEVEL_CODES.get(experience_level_enum, "")
+
 def create_logger(name: str):
     logger = logging.getLogger(f"{name}")
     logger.propagate = False